@@ -0,0 +1,169 @@
+"""ResumeAnalyzer with a prompt and response handling owned by this project."""
+import json
+
+from wyge.prebuilt_agents.resume_analyser import ResumeAnalyzer
+
+from compaction import DEFAULT_TOKEN_BUDGET, Compactor
+from jd import compile_job_description
+from timing import timed
+from usage import cost_usd
+
+REQUIRED_FIELDS = ["JD Match", "MissingKeywords", "Profile Summary", "Suggestions"]
+MAX_COMPLETION_TOKENS = 1000
+# Providers only cache prompt prefixes at least this long
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Bump when the prompt changes so cached results are not reused across prompts
+PROMPT_VERSION = "pipeline-5"
+
+def usage_from_response(response):
+    """Prompt, cached prompt, completion and total token counts from a chat completion response."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0
+    }
+
+class PipelineAnalyzer(ResumeAnalyzer):
+    """wyge's ResumeAnalyzer with a local MissingKeywords computation.
+
+    The job description is compiled once per distinct text (see jd.py) and
+    the condensed version is what goes into every prompt. With local_keywords
+    enabled its required and preferred terms are matched against the resume
+    locally (see keywords.py), and the LLM is only asked for the match score,
+    summary and suggestions. Resume text is compacted to `token_budget`
+    tokens (see compaction.py) before it is put into the prompt; keywords
+    are still matched against the full text. With a limiter (see
+    ratelimit.py) every API call goes through it and the OpenAI client's own
+    retries are turned off so the two don't compound.
+    """
+
+    def __init__(self, api_key, model="gpt-4o-mini", local_keywords=True,
+                 token_budget=DEFAULT_TOKEN_BUDGET, limiter=None):
+        super().__init__(api_key)
+        self.model = model
+        self.local_keywords = local_keywords
+        self.compactor = Compactor(token_budget, model)
+        self.limiter = limiter
+        if limiter is not None:
+            self.client = self.client.with_options(max_retries=0)
+
+    @property
+    def prompt_version(self):
+        return "+".join(filter(None, [
+            PROMPT_VERSION,
+            "local-keywords-3" if self.local_keywords else None,
+            self.compactor.version
+        ]))
+
+    def job_key(self, job_description):
+        """Cache identity of a JD: the hash of what actually reaches the prompt."""
+        return compile_job_description(job_description).digest
+
+    def build_messages(self, resume_text, job_description):
+        """Chat messages with every invariant part first and the resume last.
+
+        The system message (instructions + compiled JD) is byte-identical for
+        every resume in a batch, so the provider can serve it from its prompt
+        prefix cache; only the trailing user message differs per resume.
+        """
+        compiled = compile_job_description(job_description)
+        fields = ['"JD Match": "X%"']
+        if not self.local_keywords:
+            fields.append('"MissingKeywords": []')
+        fields += ['"Profile Summary": ""', '"Suggestions": []']
+        structure = ",\n    ".join(fields)
+        instructions = f"""You are an ATS system. Respond only with valid JSON.
+Analyze the resume in the next message against the job description below and return a JSON object.
+Format your response as a raw JSON object without any additional text or formatting.
+Use exactly this structure:
+{{
+    {structure}
+}}
+
+Job Description:
+{compiled.prompt_text()}
+"""
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": f"Resume:\n{resume_text}"},
+        ]
+
+    def caches_prompt_prefix(self, job_description):
+        """True when the shared system message is long enough for the provider to cache."""
+        system = self.build_messages("", job_description)[0]["content"]
+        return self.compactor.counter.count(system) >= PROMPT_CACHE_MIN_TOKENS
+
+    def analyze_resume(self, resume_text, job_description):
+        """Analyze a single resume based on the job description using OpenAI.
+
+        The result carries a "usage" dict with prompt, cached prompt and
+        completion tokens plus the estimated cost_usd (None for models
+        without a known price, see usage.py), a "compaction" dict with the bytes and tokens before and after
+        compaction, and "timings" with the seconds spent in each stage
+        ("rate_limit" is time spent waiting in the limiter, including backoff).
+        """
+        spans = {}
+        with timed(spans, "compact"):
+            compacted, compaction = self.compactor.compact(resume_text)
+        with timed(spans, "prompt"):
+            messages = self.build_messages(compacted, job_description)
+
+        def create():
+            with timed(spans, "llm"):
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.5,
+                    max_tokens=MAX_COMPLETION_TOKENS,
+                )
+
+        if self.limiter is None:
+            response = create()
+        else:
+            estimate = MAX_COMPLETION_TOKENS + sum(
+                self.compactor.counter.count(message["content"]) for message in messages
+            )
+            with timed(spans, "rate_limit"):
+                response = self.limiter.call(create, tokens=estimate)
+            spans["rate_limit"] -= spans.get("llm", 0.0)
+            used = getattr(getattr(response, "usage", None), "total_tokens", None)
+            if used:
+                self.limiter.tokens.refund(estimate - used)
+        with timed(spans, "parse"):
+            result = self.parse_response(response.choices[0].message.content)
+        if self.local_keywords and not result["Profile Summary"].startswith("Error:"):
+            with timed(spans, "keywords"):
+                compiled = compile_job_description(job_description)
+                result["MissingKeywords"] = compiled.keywords.missing(resume_text)
+        result["compaction"] = compaction
+        usage = usage_from_response(response)
+        usage["cost_usd"] = cost_usd(self.model, usage)
+        result["usage"] = usage
+        result["timings"] = spans
+        return result
+
+    def parse_response(self, content):
+        """Parse the model's JSON reply, falling back to an error result like wyge does."""
+        content = (content or "").strip()
+        if content.startswith("```"):
+            # Some replies arrive fenced despite the instructions
+            content = content.strip("`").removeprefix("json").strip()
+        try:
+            parsed_json = json.loads(content)
+            if self.local_keywords:
+                parsed_json.setdefault("MissingKeywords", [])
+            if all(field in parsed_json for field in REQUIRED_FIELDS):
+                return parsed_json
+            raise ValueError("Missing required fields in JSON response")
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"JSON parsing error: {str(e)}")
+            return {
+                "JD Match": "0%",
+                "MissingKeywords": [],
+                "Profile Summary": "Error: Could not analyze resume",
+                "Suggestions": ["Error processing the resume. Please try again."]
+            }
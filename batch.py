@@ -0,0 +1,370 @@
+"""Concurrent batch analysis of resumes against a single job description."""
+import hashlib
+import heapq
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from importlib.metadata import version
+from extraction import select_extractor
+from jd import compile_job_description
+from result_cache import make_key
+from text_cache import content_hash, read_bytes
+from timing import timed
+
+# Identifies the prompt in result cache keys; bumping wyge invalidates old entries
+PROMPT_VERSION = f"wyge-{version('wyge')}"
+
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("RESUME_MAX_IN_FLIGHT", "8"))
+# Describe one particular run, so they are not replayed from caches or journals
+RUN_FIELDS = ("usage", "timings")
+
+def parse_percentage(value):
+    """Parse a "NN%" match score into a float for sorting."""
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except ValueError:
+        return 0.0
+
+def error_result(filename, error):
+    """Placeholder result for a resume that could not be analysed."""
+    return {
+        "filename": filename,
+        "JD Match": "0%",
+        "MissingKeywords": [],
+        "Profile Summary": f"Error: Could not analyze resume - {error}",
+        "Suggestions": ["Error processing the resume. Please try again."]
+    }
+
+def prefiltered_result(filename, score, backend=None):
+    """Result for a resume the local prefilter kept away from the LLM."""
+    return {
+        "filename": filename,
+        "JD Match": "0%",
+        "MissingKeywords": [],
+        "Profile Summary": (f"Not scored by the LLM: local relevance {score:.0%} of the best "
+                            "resume was below the prefilter cut-off."),
+        "Suggestions": [],
+        "extractor": backend,
+        "prefiltered": True,
+        "local_score": float(score)
+    }
+
+def is_error_result(result):
+    """True for error placeholders, including the analyzer's own parse fallback."""
+    return str(result.get("Profile Summary", "")).startswith("Error:")
+
+def prompt_cache_stats(results):
+    """Totals of prompt and provider-cached prompt tokens over the LLM calls made."""
+    usages = [result["usage"] for result in results if result.get("usage")]
+    prompt_tokens = sum(usage.get("prompt_tokens", 0) for usage in usages)
+    cached_tokens = sum(usage.get("cached_tokens", 0) for usage in usages)
+    return {
+        "calls": len(usages),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "hit_rate": cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    }
+
+def rank_results(results):
+    """Sort results by JD Match, best first."""
+    return sorted(results, key=lambda r: parse_percentage(r.get("JD Match", "0%")), reverse=True)
+
+class TopK:
+    """Best `k` results by JD Match, kept in a bounded min-heap as results stream in.
+
+    Ties keep the result that arrived first, matching the stable rank_results.
+    """
+
+    def __init__(self, k):
+        self.k = max(1, int(k))
+        self.seen = 0
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, result):
+        self.seen += 1
+        entry = (parse_percentage(result.get("JD Match", "0%")), -next(self._counter), result)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def results(self):
+        """The kept results, best first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+class BatchEngine:
+    """Run extraction and LLM calls for many resumes with a bounded in-flight limit."""
+
+    def __init__(self, analyzer, max_in_flight=DEFAULT_MAX_IN_FLIGHT, text_cache=None,
+                 result_cache=None, extraction_pool=None, prefilter=None,
+                 warm_prompt_cache=False, journal=None):
+        self.analyzer = analyzer
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.text_cache = text_cache
+        self.result_cache = result_cache
+        self.extraction_pool = extraction_pool
+        self.prefilter = prefilter
+        self.warm_prompt_cache = warm_prompt_cache
+        self.journal = journal
+
+    def fingerprint(self, job_description):
+        """Hash of everything besides the resume that determines a result."""
+        job_key = getattr(self.analyzer, "job_key", None)
+        settings = "\n".join([
+            self.analyzer.model,
+            getattr(self.analyzer, "prompt_version", PROMPT_VERSION),
+            job_key(job_description) if job_key else job_description.strip()
+        ])
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def prompt_prefix_cacheable(self, job_description):
+        """Whether the provider will cache the prompt prefix shared by this JD's calls."""
+        caches = getattr(self.analyzer, "caches_prompt_prefix", None)
+        return caches(job_description) if caches is not None else True
+
+    def extract(self, file):
+        """Return (text, backend) for an uploaded file, sniffing its format from content.
+
+        Parsing is skipped when the same bytes were already extracted by that backend.
+        """
+        data = read_bytes(file)
+        backend, extract = select_extractor(data)
+        if self.text_cache is None:
+            return extract(data), backend
+        return self.text_cache.get_or_extract(data, extract, backend), backend
+
+    def analyze(self, resume_text, job_description):
+        """Score resume text against the JD, reusing a cached result when one exists.
+
+        The returned dict carries "cached": True when no API call was made.
+        """
+        if self.result_cache is None:
+            return self.analyzer.analyze_resume(resume_text, job_description)
+        job_key = getattr(self.analyzer, "job_key", None)
+        key = make_key(
+            resume_text,
+            job_key(job_description) if job_key else job_description,
+            self.analyzer.model,
+            getattr(self.analyzer, "prompt_version", PROMPT_VERSION)
+        )
+        result = self.result_cache.get(key)
+        if result is not None:
+            result["cached"] = True
+            return result
+        result = self.analyzer.analyze_resume(resume_text, job_description)
+        # Don't pin the analyzer's "could not parse" fallback for the whole TTL,
+        # and don't replay token usage on later hits that cost nothing
+        if not is_error_result(result):
+            self.result_cache.put(key, {k: v for k, v in result.items() if k not in RUN_FIELDS})
+        return dict(result, cached=False)
+
+    def process(self, filename, file, job_description):
+        """Extract and analyse one resume; failures become error results."""
+        spans = {}
+        try:
+            with timed(spans, "extract"):
+                resume_text, backend = self.extract(file)
+        except Exception as e:
+            print(f"Error processing resume {filename}: {str(e)}")
+            return error_result(filename, e)
+        return self.process_text(filename, resume_text, job_description, backend, spans=spans)
+
+    def process_text(self, filename, resume_text, job_description, backend=None, local_score=None,
+                     spans=None):
+        """Analyse already extracted text; an Exception in place of text is reported as such.
+
+        `spans` holds seconds already spent on this resume (such as
+        extraction) and is merged into the result's "timings".
+        """
+        spans = dict(spans or {})
+        try:
+            if isinstance(resume_text, Exception):
+                raise resume_text
+            with timed(spans, "analyze"):
+                result = self.analyze(resume_text, job_description)
+        except Exception as e:
+            print(f"Error processing resume {filename}: {str(e)}")
+            return error_result(filename, e)
+        result["filename"] = filename
+        result["extractor"] = backend
+        result["timings"] = dict(spans, **result.get("timings", {}))
+        if local_score is not None:
+            result["local_score"] = float(local_score)
+        return result
+
+    def iter_extracted(self, resume_files):
+        """Yield (index, filename, text, backend, spans); text is an Exception on failure.
+
+        spans is {"extract": seconds}, or empty for text served from the cache.
+        """
+        if self.extraction_pool is not None:
+            for index, filename, text, backend, seconds in self.extraction_pool.iter_extract(
+                    resume_files, self.text_cache):
+                yield index, filename, text, backend, {} if seconds is None else {"extract": seconds}
+            return
+        for index, (filename, file) in enumerate(resume_files):
+            spans = {}
+            try:
+                with timed(spans, "extract"):
+                    text, backend = self.extract(file)
+            except Exception as e:
+                text, backend = e, None
+            yield index, filename, text, backend, spans
+
+    def prefilter_extracted(self, resume_files, job_description, prefilter=None, stopped=None):
+        """Extract every resume and score them together with the prefilter.
+
+        Returns (index, filename, text, backend, spans, score, kept) tuples in
+        completion order. Files that could not be extracted have no score and
+        are kept, so the analysis step reports their error. Extraction stops,
+        and nothing is returned, once the `stopped` event is set.
+        """
+        prefilter = prefilter or self.prefilter
+        extracted = []
+        with closing(self.iter_extracted(resume_files)) as items:
+            for item in items:
+                if stopped is not None and stopped.is_set():
+                    return []
+                extracted.append(item)
+        scorable = [item for item in extracted if not isinstance(item[2], Exception)]
+        # Score against the condensed JD so boilerplate terms don't count
+        scores, keep = prefilter.select(
+            compile_job_description(job_description).text,
+            [text for _, _, text, _, _ in scorable]
+        )
+        decisions = {item[0]: (float(score), bool(kept))
+                     for item, score, kept in zip(scorable, scores, keep)}
+        return [item + decisions.get(item[0], (None, True)) for item in extracted]
+
+    def iter_results(self, resume_files, job_description, done=None):
+        """Yield one result per (filename, file) tuple, in completion order."""
+        for _, result in self.iter_indexed(resume_files, job_description, done):
+            yield result
+
+    def iter_indexed(self, resume_files, job_description, done=None):
+        """Yield (input index, result) pairs in completion order.
+
+        With a journal, resumes it already holds a result for are yielded
+        first (marked "resumed") without any work, and every new successful
+        result is appended to it as soon as it arrives. `done` is the
+        journal's load() result, for callers that run one job in several
+        calls; the journal is read when it is None.
+
+        With a prefilter, resumed resumes are still extracted and scored: its
+        cut-off is a percentile of the whole input, so every run must score
+        the same set to reject the same resumes.
+        """
+        if self.journal is None:
+            yield from self._iter_indexed(resume_files, job_description)
+            return
+        if done is None:
+            done = self.journal.load(self.fingerprint(job_description))
+        digests, resumed = [], {}
+        for index, (filename, file) in enumerate(resume_files):
+            digests.append(content_hash(read_bytes(file)))
+            if digests[-1] in done:
+                # Tokens were spent by the earlier run, not this one
+                result = {k: v for k, v in done[digests[-1]].items() if k not in RUN_FIELDS}
+                resumed[index] = dict(result, filename=filename, resumed=True)
+        if self.prefilter is not None:
+            todo = list(range(len(resume_files)))
+            results = self._iter_indexed(resume_files, job_description, resumed)
+        else:
+            yield from resumed.items()
+            todo = [index for index in range(len(resume_files)) if index not in resumed]
+            results = self._iter_indexed([resume_files[index] for index in todo], job_description)
+        for position, result in results:
+            index = todo[position]
+            # Failures and prefilter skips are retried on the next run
+            if index not in resumed and not is_error_result(result) and not result.get("prefiltered"):
+                self.journal.append(digests[index], result)
+            yield index, result
+
+    def _iter_indexed(self, resume_files, job_description, resumed=None):
+        """Yield (input index, result) pairs in completion order.
+
+        With an extraction pool, files are parsed across processes and each
+        LLM call is submitted as soon as its text is ready, so the first
+        results arrive before the whole batch has been extracted. With a
+        prefilter, the whole batch is extracted and scored locally first and
+        only the resumes it keeps are sent to the LLM. With warm_prompt_cache,
+        the first call finishes alone before the fan-out, so the provider has
+        the shared prompt prefix cached for every call after it; this is
+        skipped when the analyzer reports a prefix too short to be cached.
+
+        `resumed` maps input indices to results from an earlier run; the
+        prefilter scores those resumes but they are passed through unchanged.
+        """
+        resumed = resumed or {}
+        completed = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        warming = [self.warm_prompt_cache and len(resume_files) > 1
+                   and self.prompt_prefix_cacheable(job_description)]
+        stopped = threading.Event()
+
+        def submit(index, *task):
+            future = executor.submit(*task)
+            future.add_done_callback(lambda f: completed.put((index, f)))
+            if warming[0]:
+                warming[0] = False
+                future.exception()  # block the feeder until the first call is done
+
+        def finish(index, result):
+            future = Future()
+            future.set_result(result)
+            completed.put((index, future))
+
+        def feed():
+            # Each loop returns as soon as the consumer stops, so an abandoned
+            # batch doesn't keep extracting (and holding the shared pool)
+            try:
+                if self.prefilter is not None:
+                    for index, filename, text, backend, spans, score, kept in self.prefilter_extracted(
+                            resume_files, job_description, stopped=stopped):
+                        if stopped.is_set():
+                            return
+                        if index in resumed:
+                            finish(index, resumed[index])
+                        elif kept:
+                            submit(index, self.process_text, filename, text, job_description,
+                                   backend, score, spans)
+                        else:
+                            finish(index, dict(prefiltered_result(filename, score, backend),
+                                               timings=spans))
+                elif self.extraction_pool is not None:
+                    with closing(self.iter_extracted(resume_files)) as extracted:
+                        for index, filename, text, backend, spans in extracted:
+                            if stopped.is_set():
+                                return
+                            submit(index, self.process_text, filename, text, job_description,
+                                   backend, None, spans)
+                else:
+                    for index, (filename, file) in enumerate(resume_files):
+                        if stopped.is_set():
+                            return
+                        submit(index, self.process, filename, file, job_description)
+            except Exception as e:
+                # Once the consumer has stopped early, submitting to the shut
+                # down executor fails and nobody is left to report to
+                if not stopped.is_set():
+                    completed.put((None, e))
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            for _ in range(len(resume_files)):
+                index, future = completed.get()
+                if index is None:
+                    raise future
+                yield index, future.result()
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, resume_files, job_description):
+        """Analyse every resume and return results ranked like analyze_multiple_resumes."""
+        return rank_results(self.iter_results(resume_files, job_description))
@@ -0,0 +1,225 @@
+"""Resume text compaction: strip noise and fit the text into a prompt token budget."""
+import os
+import re
+from collections import Counter
+
+# Optional exact tokenizer; without it tokens are estimated from characters
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 0 disables truncation; whitespace, headers/footers and boilerplate are still stripped
+DEFAULT_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+# Rough characters per token for English text when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "[...]"
+
+# Sections that rarely help score a resume against a JD; dropped outright
+BOILERPLATE_HEADINGS = re.compile(
+    r"^(references?|referees|declaration|personal (details|information|data)|"
+    r"hobbies|interests|hobbies (and|&) interests)$",
+    re.IGNORECASE
+)
+# Sections kept only while budget remains after everything else
+LOW_PRIORITY_HEADINGS = re.compile(
+    r"^([a-z]+ )?(publications?|papers|presentations|talks|conferences?|posters|grants|"
+    r"funding|teaching|courses?|coursework|memberships?|affiliations|volunteering|"
+    r"activities|awards|honou?rs|patents)( (and|&) [a-z ]+)?$"
+    # Spoken languages only; "Programming Languages" is a skills section
+    r"|^((spoken|foreign) )?languages( spoken)?$|^language skills$",
+    re.IGNORECASE
+)
+# Title-case lines with these names are section headings too
+SECTION_HEADINGS = re.compile(
+    r"^((professional |career |work )?(summary|profile|objective|experience|history)|"
+    r"employment( history)?|education|qualifications|(technical |key |core )?skills|"
+    r"competencies|projects|certifications?|achievements|training)$",
+    re.IGNORECASE
+)
+# Lines dropped wherever they appear
+BOILERPLATE_LINES = re.compile(
+    r"^(page \d+( of \d+)?|\d{1,3} ?(/|of) ?\d{1,3}|-? ?\d{1,3} ?-?|"
+    r"references (are )?available (up)?on request\.?|i hereby declare\b.*|"
+    r"curriculum vitae|resume|r[ée]sum[ée])$",
+    re.IGNORECASE
+)
+# A short line on more than half the pages of a document with at least this
+# many pages is a running page header or footer
+REPEATED_LINE_MIN_PAGES = 3
+REPEATED_LINE_MAX_LENGTH = 80
+PAGE_BREAK = "\f"
+
+class TokenCounter:
+    """Count prompt tokens with tiktoken when installed, else estimate from length."""
+
+    def __init__(self, model="gpt-4o-mini"):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("o200k_base")
+
+    @property
+    def name(self):
+        return self.encoding.name if self.encoding is not None else "estimate"
+
+    def count(self, text):
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+def _heading(line):
+    """Heading text of a line that looks like a section title, else None."""
+    stripped = line.strip("#*:-= ").strip()
+    if not stripped or len(stripped) > 40 or stripped.endswith((".", ",")):
+        return None
+    if line.rstrip().endswith(":") or stripped.isupper() or any(
+            pattern.match(stripped) for pattern in
+            (SECTION_HEADINGS, BOILERPLATE_HEADINGS, LOW_PRIORITY_HEADINGS)):
+        return stripped
+    return None
+
+def running_lines(pages):
+    """Short lines found on most pages: running headers and footers.
+
+    Needs page breaks to tell a header from a job title or heading that a
+    resume simply repeats, so text without them has none.
+    """
+    if len(pages) < REPEATED_LINE_MIN_PAGES:
+        return set()
+    counts = Counter(line for page in pages for line in set(page)
+                     if line and len(line) <= REPEATED_LINE_MAX_LENGTH)
+    return {line for line, count in counts.items() if count > len(pages) / 2}
+
+def clean_lines(text, strip_running=True):
+    """Collapse whitespace and drop page furniture, running header/footer lines
+    (when strip_running) and boilerplate sections. Returns the remaining lines."""
+    pages = [[" ".join(line.split()) for line in page.splitlines()]
+             for page in text.split(PAGE_BREAK)]
+    lines = [line for page in pages for line in page]
+    repeated = running_lines(pages) if strip_running else set()
+
+    kept, seen_repeated = [], set()
+    skipping = False
+    for line in lines:
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        heading = _heading(line)
+        if heading is not None:
+            skipping = bool(BOILERPLATE_HEADINGS.match(heading))
+        if skipping or BOILERPLATE_LINES.match(line):
+            continue
+        if line in repeated:
+            # Keep the first copy, which is usually the candidate's name/contact line
+            if line in seen_repeated:
+                continue
+            seen_repeated.add(line)
+        kept.append(line)
+    while kept and not kept[-1]:
+        kept.pop()
+    return kept
+
+def split_sections(lines):
+    """Group lines into (heading, lines) sections; text before any heading has heading None."""
+    sections = [(None, [])]
+    for line in lines:
+        heading = _heading(line) if line else None
+        if heading is not None:
+            sections.append((heading, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+def _cut_line(line, budget, counter):
+    """Longest word prefix of `line` that fits in `budget` tokens, or "" if none does."""
+    words = line.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if counter.count(" ".join(words[:middle])) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+def fit_to_budget(sections, budget, counter):
+    """Keep lines, in document order, until `budget` tokens are used.
+
+    Ordinary sections are filled first, top to bottom, and low-priority ones
+    (publications, talks, ...) get whatever is left. The line that crosses
+    the budget is cut at a word boundary and a section that is cut short ends
+    with TRUNCATION_MARKER. Returns (text, truncated).
+    """
+    order = sorted(range(len(sections)),
+                   key=lambda i: bool(sections[i][0] and LOW_PRIORITY_HEADINGS.match(sections[i][0])))
+    marker_cost = counter.count(" " + TRUNCATION_MARKER + "\n")
+    remaining = budget
+    kept = {}
+    truncated = False
+    for i in order:
+        lines = []
+        for line in sections[i][1]:
+            cost = counter.count(line + "\n")
+            if cost > remaining:
+                truncated = True
+                if remaining > marker_cost:
+                    head = _cut_line(line, remaining - marker_cost, counter)
+                    lines.append(f"{head} {TRUNCATION_MARKER}" if head else TRUNCATION_MARKER)
+                    remaining = 0
+                break
+            lines.append(line)
+            remaining -= cost
+        kept[i] = lines
+    text = "\n".join(line for i in range(len(sections)) for line in kept[i])
+    return text, truncated
+
+class Compactor:
+    """Shrink extracted resume text before it is sent to the LLM.
+
+    Whitespace is collapsed, page numbers and boilerplate sections
+    (references, declaration, personal details, hobbies) are removed, and
+    the rest is cut to `token_budget` tokens, dropping low-priority sections
+    first. Running headers/footers are removed too, except with a budget of
+    0, which disables the cut and keeps every other line.
+    """
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, model="gpt-4o-mini"):
+        self.token_budget = max(0, int(token_budget))
+        self.counter = TokenCounter(model)
+
+    @property
+    def version(self):
+        """Identifies the compaction settings in cache keys."""
+        return f"compact3-{self.token_budget}-{self.counter.name}"
+
+    def compact(self, text):
+        """Return (compacted text, stats) where stats holds bytes/tokens before and after."""
+        lines = clean_lines(text, strip_running=bool(self.token_budget))
+        compacted = "\n".join(lines)
+        truncated = False
+        if self.token_budget and self.counter.count(compacted) > self.token_budget:
+            compacted, truncated = fit_to_budget(split_sections(lines), self.token_budget,
+                                                 self.counter)
+        stats = {
+            "bytes_before": len(text.encode("utf-8")),
+            "bytes_after": len(compacted.encode("utf-8")),
+            "tokens_before": self.counter.count(text),
+            "tokens_after": self.counter.count(compacted),
+            "truncated": truncated
+        }
+        return compacted, stats
+
+def compaction_stats(results):
+    """Totals of bytes and tokens saved by compaction over a batch of results."""
+    stats = [result["compaction"] for result in results if result.get("compaction")]
+    return {
+        "resumes": len(stats),
+        "truncated": sum(1 for s in stats if s["truncated"]),
+        "bytes_saved": sum(s["bytes_before"] - s["bytes_after"] for s in stats),
+        "tokens_before": sum(s["tokens_before"] for s in stats),
+        "tokens_saved": sum(s["tokens_before"] - s["tokens_after"] for s in stats)
+    }
@@ -0,0 +1,322 @@
+"""Text extraction for PDF and DOCX resumes: format sniffing, backends and a process pool."""
+import io
+import json
+import os
+import queue
+import threading
+import time
+import zipfile
+from xml.etree import ElementTree
+from importlib.metadata import version
+from multiprocessing import get_context
+
+import PyPDF2
+from docx import Document
+
+from text_cache import content_hash, read_bytes
+
+# Optional, faster PDF libraries; registered only when installed
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+DEFAULT_PROCESSES = int(os.getenv("RESUME_EXTRACT_PROCESSES", str(os.cpu_count() or 1)))
+DEFAULT_TIMEOUT = float(os.getenv("RESUME_EXTRACT_TIMEOUT", "30"))
+DEFAULT_MAX_TASKS_PER_CHILD = int(os.getenv("RESUME_EXTRACT_MAX_TASKS_PER_CHILD", "50"))
+
+# "auto" or a backend family such as "pymupdf" / "pypdf2"
+PDF_BACKEND_POLICY = os.getenv("RESUME_PDF_BACKEND", "auto")
+PDF_BENCHMARK_PATH = os.getenv(
+    "RESUME_PDF_BENCHMARK",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_analyser", "pdf_benchmark.json")
+)
+# Used by the auto policy when there are no benchmark results for this machine
+PDF_PREFERENCE = ["pymupdf", "pypdfium2", "pypdf", "pypdf2"]
+
+# Separates the pages of PDF text, so compaction can spot running headers
+PAGE_BREAK = "\f"
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# Backend name -> function(data) -> text. Names carry the library version so
+# that they double as text cache ids.
+BACKENDS = {}
+# Backend name -> format it handles
+BACKEND_FORMATS = {}
+# Format -> name of the backend used for it
+EXTRACTORS = {}
+
+def register_extractor(file_format, name, default=True):
+    """Register a text extraction backend for a sniffed file format."""
+    def decorator(func):
+        BACKENDS[name] = func
+        BACKEND_FORMATS[name] = file_format
+        if default or file_format not in EXTRACTORS:
+            EXTRACTORS[file_format] = name
+        return func
+    return decorator
+
+@register_extractor("pdf", f"pypdf2-{version('PyPDF2')}")
+def extract_pdf_pypdf2(data):
+    """Extract PDF text page by page with PyPDF2."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return PAGE_BREAK.join(page.extract_text() or "" for page in reader.pages)
+
+if pymupdf is not None:
+    @register_extractor("pdf", f"pymupdf-{version('pymupdf')}", default=False)
+    def extract_pdf_pymupdf(data):
+        """Extract PDF text with PyMuPDF (MuPDF bindings)."""
+        with pymupdf.open(stream=data, filetype="pdf") as doc:
+            return PAGE_BREAK.join(page.get_text() for page in doc)
+
+if pypdfium2 is not None:
+    @register_extractor("pdf", f"pypdfium2-{version('pypdfium2')}", default=False)
+    def extract_pdf_pypdfium2(data):
+        """Extract PDF text with pypdfium2 (PDFium bindings)."""
+        document = pypdfium2.PdfDocument(data)
+        try:
+            chunks = []
+            for page in document:
+                textpage = page.get_textpage()
+                chunks.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return PAGE_BREAK.join(chunks)
+        finally:
+            document.close()
+
+if pypdf is not None:
+    @register_extractor("pdf", f"pypdf-{version('pypdf')}", default=False)
+    def extract_pdf_pypdf(data):
+        """Extract PDF text with pypdf, the maintained successor of PyPDF2."""
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        return PAGE_BREAK.join(page.extract_text() or "" for page in reader.pages)
+
+@register_extractor("docx", f"python-docx-{version('python-docx')}")
+def extract_docx_python_docx(data):
+    """Extract DOCX paragraph text with python-docx."""
+    doc = Document(io.BytesIO(data))
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+def backend_family(name):
+    """Strip the version suffix from a backend name ("pymupdf-1.24.0" -> "pymupdf")."""
+    return name.rsplit("-", 1)[0]
+
+def pdf_backends():
+    """Names of every registered PDF backend."""
+    return [name for name, file_format in BACKEND_FORMATS.items() if file_format == "pdf"]
+
+def load_pdf_benchmark(path=PDF_BENCHMARK_PATH):
+    """Return {backend name: pages/sec} from a saved benchmark, or {}.
+
+    Backends that failed on any file of the corpus are left out.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {name: stats["pages_per_sec"] for name, stats in json.load(f)["backends"].items()
+                    if not stats.get("failures")}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+def choose_pdf_backend(policy=PDF_BACKEND_POLICY, benchmark_path=PDF_BENCHMARK_PATH):
+    """Pick the PDF backend for a policy.
+
+    A family name selects that library if installed. "auto" picks the fastest
+    installed backend that extracted the whole saved benchmark corpus,
+    falling back to PDF_PREFERENCE.
+    """
+    available = pdf_backends()
+    if policy != "auto":
+        for name in available:
+            if backend_family(name) == policy:
+                return name
+        raise ValueError(f"PDF backend {policy!r} is not installed; available: {available}")
+    measured = load_pdf_benchmark(benchmark_path)
+    ranked = [name for name in available if name in measured]
+    if ranked:
+        return max(ranked, key=measured.get)
+
+    def preference(name):
+        family = backend_family(name)
+        return PDF_PREFERENCE.index(family) if family in PDF_PREFERENCE else len(PDF_PREFERENCE)
+
+    return min(available, key=preference)
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_TEXT = WORD_NS + "t"
+_TAB = WORD_NS + "tab"
+_BREAKS = (WORD_NS + "br", WORD_NS + "cr")
+_PARAGRAPH = WORD_NS + "p"
+
+def iter_docx_text(data):
+    """Yield text runs from word/document.xml without building a document model.
+
+    The XML is parsed incrementally straight out of the archive and every
+    finished paragraph is detached from the tree, so memory stays flat however
+    long the document is. Unlike python-docx's doc.paragraphs this also yields
+    paragraphs inside tables.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        with archive.open("word/document.xml") as xml:
+            stack = []
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                tag = elem.tag
+                if tag == _TEXT:
+                    if elem.text:
+                        yield elem.text
+                elif tag == _TAB:
+                    yield "\t"
+                elif tag in _BREAKS:
+                    yield "\n"
+                elif tag == _PARAGRAPH:
+                    yield "\n"
+                    if stack:
+                        stack[-1].remove(elem)
+
+@register_extractor("docx", "docx-stream-1")
+def extract_docx_streaming(data):
+    """Extract DOCX text by streaming the document XML."""
+    return "".join(iter_docx_text(data))
+
+EXTRACTORS["pdf"] = choose_pdf_backend()
+
+def sniff_format(data):
+    """Identify a resume format from its magic bytes, or return None."""
+    # The PDF header may follow a little junk; readers accept it within 1 KiB
+    if PDF_MAGIC in data[:1024]:
+        return "pdf"
+    if data.startswith(ZIP_MAGIC) and b"word/document.xml" in data:
+        return "docx"
+    return None
+
+def select_extractor(data):
+    """Return the (backend name, function) that should parse these bytes."""
+    file_format = sniff_format(data)
+    if file_format is None:
+        raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
+    name = EXTRACTORS[file_format]
+    return name, BACKENDS[name]
+
+def run_backend(name, data):
+    """Extract text with a backend chosen by name (picklable entry point for workers)."""
+    return BACKENDS[name](data)
+
+class ExtractionTimeout(Exception):
+    """Raised in place of text when a file takes longer than the per-file timeout."""
+
+class ExtractionPool:
+    """Extract text from many files across worker processes.
+
+    At most `processes` files are in flight, so each file's timeout runs from
+    roughly when a worker picks it up. Workers are replaced after
+    `max_tasks_per_child` files, and a file that overruns its timeout has the
+    whole pool terminated and restarted so the stuck worker cannot linger.
+    """
+
+    def __init__(self, processes=DEFAULT_PROCESSES, timeout=DEFAULT_TIMEOUT,
+                 max_tasks_per_child=DEFAULT_MAX_TASKS_PER_CHILD):
+        self.processes = max(1, int(processes))
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # spawn rather than fork: the Streamlit server is multi-threaded
+        self._pool = get_context("spawn").Pool(
+            self.processes, maxtasksperchild=self.max_tasks_per_child
+        )
+
+    def close(self):
+        """Terminate the worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def iter_extract(self, resume_files, text_cache=None):
+        """Yield (index, filename, text, backend, seconds) as each file becomes available.
+
+        Cache hits and unsupported files come first, with seconds None, then
+        pool results in completion order with the time each spent in a worker.
+        """
+        jobs = []
+        for index, (filename, file) in enumerate(resume_files):
+            data = read_bytes(file)
+            try:
+                backend, _ = select_extractor(data)
+            except ValueError as e:
+                yield index, filename, e, None, None
+                continue
+            digest = content_hash(data)
+            text = text_cache.get(digest, backend) if text_cache is not None else None
+            if text is not None:
+                yield index, filename, text, backend, None
+            else:
+                jobs.append((index, filename, data, digest, backend))
+
+        with self._lock:
+            for job, text, seconds in self._run(jobs):
+                index, filename, _, digest, backend = job
+                if text_cache is not None and not isinstance(text, Exception):
+                    text_cache.put(digest, backend, text)
+                yield index, filename, text, backend, seconds
+
+    def _run(self, jobs):
+        if not jobs:
+            return
+        if self._pool is None:
+            self._start()
+        done = queue.Queue()
+        pending = list(reversed(jobs))
+        in_flight = {}
+        generation = 0
+
+        def submit(job):
+            index, _, data, _, backend = job
+            on_done = lambda value, g=generation, i=index: done.put((g, i, value))
+            self._pool.apply_async(
+                run_backend, (backend, data), callback=on_done, error_callback=on_done
+            )
+            in_flight[index] = (job, time.monotonic())
+
+        while pending or in_flight:
+            while pending and len(in_flight) < self.processes:
+                submit(pending.pop())
+            oldest = min(started for _, started in in_flight.values())
+            wait = max(0.0, oldest + self.timeout - time.monotonic())
+            try:
+                finished_generation, index, value = done.get(timeout=wait)
+            except queue.Empty:
+                now = time.monotonic()
+                for index, (job, started) in list(in_flight.items()):
+                    if now - started >= self.timeout:
+                        del in_flight[index]
+                        yield job, ExtractionTimeout(
+                            f"Extraction took longer than {self.timeout:g}s"
+                        ), now - started
+                # Recycle the pool to kill the stuck worker, then requeue the rest
+                self.close()
+                self._start()
+                generation += 1
+                pending.extend(job for job, _ in in_flight.values())
+                in_flight.clear()
+                continue
+            if finished_generation != generation or index not in in_flight:
+                continue
+            job, started = in_flight.pop(index)
+            yield job, value, time.monotonic() - started
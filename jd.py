@@ -0,0 +1,123 @@
+"""Job description preprocessing, done once per batch and shared by every resume."""
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+
+from keywords import KeywordMatcher, extract_required_terms
+from prefilter import tokenize
+
+# Whole headings about the employer rather than the job. Anchored at both ends
+# so "About the role" or "About you" are kept.
+BOILERPLATE_HEADINGS = re.compile(
+    r"^(about (us|the company)|who we are|our (culture|mission|values|story)|"
+    r"(benefits|perks)( (and|&) (benefits|perks))?|what we offer|why (join|work (with|for|at)) us|"
+    r"compensation( (and|&) benefits)?|salary|how to apply|"
+    r"equal (employment )?opportunity( employer)?|eeo( statement)?|diversity( (and|&) inclusion)?)$",
+    re.IGNORECASE
+)
+PREFERRED_HEADINGS = re.compile(
+    r"(nice to have|preferred|bonus|pluses|desirable|good to have)", re.IGNORECASE
+)
+# Sentences dropped wherever they appear
+BOILERPLATE_SENTENCES = re.compile(
+    r"(equal opportunity employer|without regard to (race|color)|reasonable accommodation|"
+    r"apply (now|today)|click apply|e-verify)",
+    re.IGNORECASE
+)
+PREFERRED_LINE = re.compile(r"(nice to have|preferred|is a plus|a bonus|good to have)", re.IGNORECASE)
+SENIORITY = [
+    ("Intern", re.compile(r"\b(intern|internship)\b", re.IGNORECASE)),
+    ("Principal", re.compile(r"\b(principal|staff|distinguished)\b", re.IGNORECASE)),
+    ("Lead", re.compile(r"\b(lead|head of|manager)\b", re.IGNORECASE)),
+    ("Senior", re.compile(r"\b(senior|sr\.?)\b", re.IGNORECASE)),
+    ("Junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|graduate)\b", re.IGNORECASE)),
+    ("Mid", re.compile(r"\b(mid[- ]level|intermediate)\b", re.IGNORECASE)),
+]
+YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?years?", re.IGNORECASE)
+
+def _is_heading(line):
+    stripped = line.strip().rstrip(":").strip("#* ")
+    return bool(stripped) and len(stripped) <= 60 and (
+        line.strip().endswith(":") or line.strip().startswith("#") or stripped.isupper()
+    )
+
+class CompiledJobDescription:
+    """Normalised job description with its extracted requirements.
+
+    Attributes: text (condensed JD sent to the LLM), required and preferred
+    skill lists, seniority and min_years (guesses from wording, for display
+    only), key_phrases and digest (hash of text).
+    """
+
+    def __init__(self, text, required, preferred, seniority, min_years, key_phrases):
+        self.text = text
+        self.required = required
+        self.preferred = preferred
+        self.seniority = seniority
+        self.min_years = min_years
+        self.key_phrases = key_phrases
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.keywords = KeywordMatcher(required + preferred)
+
+    def prompt_text(self):
+        """JD block for the LLM prompt: the condensed text alone.
+
+        The skill lists and seniority guess are left out; the skills are
+        already in the text, and the regex seniority guess is wrong often
+        enough ("our staff of 200") that stating it would mislead the model.
+        """
+        return self.text
+
+def normalize_job_description(job_description):
+    """Collapse whitespace and drop boilerplate sections and sentences.
+
+    Returns (text, preferred_text): the condensed JD and the part of it that
+    lists preferred rather than required qualifications.
+    """
+    kept, preferred = [], []
+    skipping = False
+    in_preferred = False
+    for raw_line in job_description.splitlines():
+        line = " ".join(raw_line.split())
+        if not line:
+            continue
+        if _is_heading(raw_line):
+            skipping = bool(BOILERPLATE_HEADINGS.match(line.strip("#*: ")))
+            in_preferred = bool(PREFERRED_HEADINGS.search(line))
+            if skipping:
+                continue
+        elif skipping:
+            continue
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+", line) if not BOILERPLATE_SENTENCES.search(s)]
+        line = " ".join(sentences)
+        if not line:
+            continue
+        kept.append(line)
+        if in_preferred or PREFERRED_LINE.search(line):
+            preferred.append(line)
+    return "\n".join(kept), "\n".join(preferred)
+
+def extract_key_phrases(text, limit=10):
+    """Most frequent two-word phrases, a cheap summary of what the JD stresses."""
+    tokens = tokenize(text)
+    counts = Counter(zip(tokens, tokens[1:]))
+    return [" ".join(pair) for pair, count in counts.most_common(limit) if count > 1]
+
+@lru_cache(maxsize=64)
+def compile_job_description(job_description):
+    """Compile a raw job description; cached so a batch pays for it once."""
+    text, preferred_text = normalize_job_description(job_description)
+    preferred = extract_required_terms(preferred_text) if preferred_text else []
+    required = [term for term in extract_required_terms(text) if term not in preferred]
+
+    seniority = next((level for level, pattern in SENIORITY if pattern.search(text)), None)
+    years = [int(match) for match in YEARS.findall(text)]
+    return CompiledJobDescription(
+        text=text,
+        required=required,
+        preferred=preferred,
+        seniority=seniority,
+        min_years=min(years) if years else None,
+        key_phrases=extract_key_phrases(text)
+    )
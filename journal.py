@@ -0,0 +1,102 @@
+"""Append-only per-job journals so interrupted batches resume where they stopped."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_JOURNAL_DIR = os.getenv(
+    "RESUME_JOURNAL_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_analyser", "jobs")
+)
+DEFAULT_JOURNAL_TTL = float(os.getenv("RESUME_JOURNAL_TTL", str(7 * 24 * 3600)))
+
+# One lock per journal file, shared by every Journal instance in the process,
+# so two sessions resuming the same job don't both start the file
+_locks = {}
+_locks_lock = threading.Lock()
+
+def _path_lock(path):
+    with _locks_lock:
+        return _locks.setdefault(os.path.abspath(path), threading.Lock())
+
+def make_job_id(fingerprint, resume_keys):
+    """Deterministic job id for a set of resumes analysed with the given settings.
+
+    resume_keys identify the resumes (content hashes, or paths). Submitting
+    the same resumes in any order with the same JD and settings gives the
+    same id, so a rerun after a crash picks up the old journal.
+    """
+    payload = "\n".join([fingerprint] + sorted(set(resume_keys)))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+class Journal:
+    """JSONL file of finished results for one job, keyed by resume content hash.
+
+    The first line records the settings fingerprint; each further line is
+    {"key": digest, "result": {...}} and is flushed as soon as it is written.
+    A line cut short by a crash, or any line that is not such an entry, is
+    ignored on load.
+    """
+
+    def __init__(self, job_id, journal_dir=DEFAULT_JOURNAL_DIR):
+        if not job_id or os.sep in job_id or job_id.startswith("."):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        self.job_id = job_id
+        self.path = os.path.join(journal_dir, f"{job_id}.jsonl")
+        self._lock = _path_lock(self.path)
+        os.makedirs(journal_dir, exist_ok=True)
+
+    def load(self, fingerprint):
+        """Return {digest: result} of finished resumes, starting the journal if new.
+
+        Raises ValueError when the job id was used with a different JD or settings.
+        """
+        entries = {}
+        with self._lock, open(self.path, "ab+") as f:
+            f.seek(0)
+            first = f.readline()
+            try:
+                header = json.loads(first) if first.endswith(b"\n") else None
+            except json.JSONDecodeError:
+                header = None
+            if header is None:
+                # New journal, or the process died while writing its header
+                f.truncate(0)
+                f.write((json.dumps({"fingerprint": fingerprint, "created": time.time()}) + "\n")
+                        .encode("utf-8"))
+                return entries
+            if header.get("fingerprint") != fingerprint:
+                raise ValueError(f"Job {self.job_id} was started with a different "
+                                 "job description or settings")
+            end = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # half-written by a crash
+                end += len(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and "key" in entry and "result" in entry:
+                    entries[entry["key"]] = entry["result"]
+            # Drop a partial last line so the next append starts on a fresh line
+            f.truncate(end)
+        return entries
+
+    def append(self, digest, result):
+        """Record a finished result."""
+        line = json.dumps({"key": digest, "result": result}, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+
+def purge_expired(journal_dir=DEFAULT_JOURNAL_DIR, ttl=DEFAULT_JOURNAL_TTL):
+    """Delete journals not written to for longer than the TTL."""
+    if not ttl or not os.path.isdir(journal_dir):
+        return
+    cutoff = time.time() - ttl
+    for name in os.listdir(journal_dir):
+        path = os.path.join(journal_dir, name)
+        if name.endswith(".jsonl") and os.path.getmtime(path) < cutoff:
+            os.remove(path)
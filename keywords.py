@@ -0,0 +1,263 @@
+"""Deterministic keyword matching between a job description and resume text.
+
+Required terms are the known skills (the synonym table below, extendable with
+a JSON file) named in the job description. They are compiled into an
+Aho-Corasick automaton, so each resume is checked for every term in a single
+pass over its text.
+"""
+import json
+import os
+import re
+from collections import deque
+
+# Display name -> spellings that count as the same skill (all lower case)
+SYNONYMS = {
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript", "ts"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "React": ["react", "react.js", "reactjs"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Scala": ["scala"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "SQL": ["sql"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "Kafka": ["kafka", "apache kafka"],
+    "Spark": ["spark", "apache spark", "pyspark"],
+    "Hadoop": ["hadoop"],
+    "Airflow": ["airflow", "apache airflow"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring", "spring boot", "springboot"],
+    "REST APIs": ["rest", "restful", "rest api", "rest apis", "restful apis"],
+    "GraphQL": ["graphql"],
+    "gRPC": ["grpc"],
+    "Microservices": ["microservices", "microservice"],
+    "Docker": ["docker", "containers", "containerization"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "CI/CD": ["ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Jenkins": ["jenkins"],
+    "Git": ["git", "github", "gitlab"],
+    "Linux": ["linux", "unix"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "Cloud Computing": ["cloud computing", "cloud infrastructure"],
+    "LLMs": ["llm", "llms", "large language models", "large language model"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch", "torch"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Engineering": ["data engineering", "etl", "data pipelines"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Excel": ["excel", "ms excel", "microsoft excel"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "Project Management": ["project management"],
+    "Communication": ["communication skills", "communication"],
+    "Leadership": ["leadership", "team lead", "people management"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+    "Unit Testing": ["unit testing", "unit tests", "tdd", "test-driven development"],
+    "Security": ["security", "cybersecurity", "application security"],
+    "dbt": ["dbt", "data build tool"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery", "big query"],
+    "Databricks": ["databricks"],
+    "Looker": ["looker"],
+    "Flink": ["flink", "apache flink"],
+    "RabbitMQ": ["rabbitmq"],
+    "Cassandra": ["cassandra"],
+    "DynamoDB": ["dynamodb"],
+    "Prometheus": ["prometheus"],
+    "Grafana": ["grafana"],
+    "Helm": ["helm"],
+    "Nginx": ["nginx"],
+    "Next.js": ["next.js", "nextjs"],
+    "Svelte": ["svelte"],
+    "React Native": ["react native"],
+    "Flutter": ["flutter"],
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "Selenium": ["selenium"],
+    "Cypress": ["cypress"],
+    "Jest": ["jest"],
+    "Pytest": ["pytest"],
+    "Jira": ["jira"],
+    "Figma": ["figma"],
+    "Salesforce": ["salesforce"],
+    "SAP": ["sap"],
+    "MATLAB": ["matlab"],
+}
+
+# Extra skills for a deployment: a JSON file of {"Display name": ["spelling", ...]}
+SKILLS_PATH = os.getenv("RESUME_SKILLS_PATH")
+if SKILLS_PATH and os.path.exists(SKILLS_PATH):
+    with open(SKILLS_PATH, encoding="utf-8") as f:
+        SYNONYMS.update({display: [variant.lower() for variant in variants]
+                         for display, variants in json.load(f).items()})
+
+# Spellings that are also everyday English ("the rest of", "excel at"); in a job
+# description or resume they only count when written as a name, e.g. "Spring", "REST"
+_AMBIGUOUS = frozenset([
+    "rest", "spring", "swift", "rust", "go", "excel", "spark", "flask", "containers",
+    "agile", "security", "communication", "js", "ts", "torch", "mongo", "unix",
+    "helm", "jest", "looker", "snowflake", "cassandra", "flutter", "prometheus", "sap"
+])
+
+_WORD_CHARS = re.compile(r"[\w]")
+# Characters after which a capital letter may just start a sentence or line
+_SENTENCE_ENDS = ".!?\n\r\f"
+# A lower-case word following on: the capital started a sentence ("Go beyond")
+_RUNS_ON = re.compile(r"[ \t]+[a-z]")
+
+def normalize(text):
+    """Lower-case and unify the punctuation variants seen in pasted documents."""
+    return (text.lower()
+            .replace("‐", "-").replace("‑", "-").replace("–", "-")
+            .replace(" ", " "))
+
+_ALIASES = {variant: display for display, variants in SYNONYMS.items() for variant in variants}
+_ALIASES.update({display.lower(): display for display in SYNONYMS})
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every pattern occurrence in one pass over the text."""
+
+    def __init__(self, patterns):
+        """patterns maps a lower-case pattern string to the value reported on a match."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(pattern), value))
+
+        # Breadth-first pass to wire failure links and merge outputs
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                if state:
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, value) for each whole-word match in text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                start = end - length
+                # Only count whole words: "java" must not match inside "javascript"
+                if start > 0 and _WORD_CHARS.match(text[start - 1]):
+                    continue
+                if end < len(text) and _WORD_CHARS.match(text[end]):
+                    continue
+                yield start, end, value
+
+def _written_as_name(original, start, end):
+    """True when the span is capitalised like a name, not just at a sentence start.
+
+    After a bullet marker, colon or comma a capital names a list item
+    ("- Rust", "Skills: Go"). At the start of a sentence or line it only
+    does when no lower-case word follows ("Go, Rust" but not "Go beyond").
+    """
+    word = original[start:end]
+    if word.isupper():
+        return True  # "REST", "JS"
+    if not word[:1].isupper():
+        return False
+    position = start - 1
+    while position >= 0 and original[position] in " \t":
+        position -= 1
+    if position >= 0 and original[position] not in _SENTENCE_ENDS:
+        return True
+    return not _RUNS_ON.match(original, end)
+
+def _iter_terms(automaton, text):
+    """Yield (start, display) for each match of an automaton built by _patterns().
+
+    Ambiguous spellings only count where the original text writes them as names.
+    """
+    normalized = normalize(text)
+    # normalize() keeps offsets unless lower() changed a character's length
+    original = text if len(normalized) == len(text) else None
+    for start, end, (variant, display) in automaton.iter_matches(normalized):
+        if variant in _AMBIGUOUS and (original is None or not _written_as_name(original, start, end)):
+            continue
+        yield start, display
+
+def _patterns(aliases):
+    """Aho-Corasick patterns from {spelling: display name}."""
+    return {variant: (variant, display) for variant, display in aliases.items()}
+
+def extract_required_terms(job_description):
+    """Known skills named in the job description, as display names in order of appearance.
+
+    Only the synonym vocabulary is recognised, so company names, places and
+    ordinary capitalised words are never reported as missing skills.
+    """
+    found = {}
+    for start, display in _iter_terms(_VOCABULARY, job_description):
+        found.setdefault(display, start)
+    return sorted(found, key=found.get)
+
+class KeywordMatcher:
+    """Compiled required terms of one job description."""
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        aliases = {}
+        for display in self.terms:
+            aliases[display.lower()] = display
+            for variant in SYNONYMS.get(display, ()):
+                aliases[variant] = display
+        self._automaton = AhoCorasick(_patterns(aliases))
+
+    def found(self, resume_text):
+        """Set of required terms present in the resume."""
+        return {display for _, display in _iter_terms(self._automaton, resume_text)}
+
+    def missing(self, resume_text):
+        """Required terms absent from the resume, in job description order."""
+        present = self.found(resume_text)
+        return [term for term in self.terms if term not in present]
+
+_VOCABULARY = AhoCorasick(_patterns(_ALIASES))
@@ -0,0 +1,97 @@
+"""Measure pages/sec of every installed PDF backend on a local corpus.
+
+    python pdf_benchmark.py path/to/resumes [--repeat 3] [--save]
+
+With --save the results are written where extraction.py's "auto" policy
+(RESUME_PDF_BACKEND=auto) looks for them, so the fastest backend on this
+machine is used from the next start.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import time
+from datetime import datetime
+
+import PyPDF2
+
+from extraction import BACKENDS, PDF_BENCHMARK_PATH, pdf_backends
+
+def load_corpus(path):
+    """Return [(filename, bytes, pages)] for every PDF under path."""
+    corpus = []
+    for filename in sorted(glob.glob(os.path.join(path, "**", "*.pdf"), recursive=True)):
+        with open(filename, "rb") as f:
+            data = f.read()
+        try:
+            pages = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+        except Exception as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        corpus.append((filename, data, pages))
+    return corpus
+
+def benchmark(corpus, repeat=3):
+    """Return {backend name: stats} with the best of `repeat` runs per backend.
+
+    Only pages of files a backend actually extracted count towards its
+    pages/sec, so a backend that fails fast does not look fast.
+    """
+    results = {}
+    for name in pdf_backends():
+        extract = BACKENDS[name]
+        best = None
+        failures = 0
+        extracted_pages = 0
+        for _ in range(repeat):
+            failures = 0
+            extracted_pages = 0
+            start = time.perf_counter()
+            for _, data, pages in corpus:
+                try:
+                    extract(data)
+                except Exception:
+                    failures += 1
+                else:
+                    extracted_pages += pages
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {
+            "pages_per_sec": extracted_pages / best if best else 0.0,
+            "seconds": best,
+            "pages": extracted_pages,
+            "failures": failures
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory searched recursively for *.pdf files")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; the best is kept")
+    parser.add_argument("--save", action="store_true", help=f"Write results to {PDF_BENCHMARK_PATH}")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        parser.error(f"No readable PDF files found under {args.corpus}")
+    total_pages = sum(pages for _, _, pages in corpus)
+    print(f"{len(corpus)} files, {total_pages} pages")
+
+    results = benchmark(corpus, args.repeat)
+    for name, stats in sorted(results.items(), key=lambda item: -item[1]["pages_per_sec"]):
+        print(f"{name:<24} {stats['pages_per_sec']:>10.1f} pages/sec  ({stats['failures']} failures)")
+
+    if args.save:
+        os.makedirs(os.path.dirname(PDF_BENCHMARK_PATH), exist_ok=True)
+        with open(PDF_BENCHMARK_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "generated": datetime.now().isoformat(timespec="seconds"),
+                "files": len(corpus),
+                "pages": total_pages,
+                "backends": results
+            }, f, indent=2)
+        print(f"Saved to {PDF_BENCHMARK_PATH}")
+
+if __name__ == "__main__":
+    main()
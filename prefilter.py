@@ -0,0 +1,81 @@
+"""Local BM25 relevance scoring used to decide which resumes go to the LLM."""
+import math
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+DEFAULT_KEEP_PERCENTILE = float(os.getenv("RESUME_PREFILTER_KEEP_PERCENTILE", "20"))
+DEFAULT_MIN_SCORE = float(os.getenv("RESUME_PREFILTER_MIN_SCORE", "0"))
+# Below this many candidates every resume is sent to the LLM anyway
+DEFAULT_MIN_BATCH = int(os.getenv("RESUME_PREFILTER_MIN_BATCH", "10"))
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could
+did do does for from had has have having he her his how i if in into is it its itself
+may me more most must my no not of on or other our ours out over own per same she should
+so some such than that the their them then there these they this those through to too
+under until up us very was we were what when where which while who whom why will with
+would you your yours able ability across etc including strong excellent good work working
+experience experienced years year team role candidate candidates ideal looking join
+""".split())
+
+def tokenize(text):
+    """Lower-case word tokens, keeping tech spellings like c++, c#, node.js."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+def bm25_scores(job_description, resume_texts, k1=1.5, b=0.75):
+    """BM25 score of each resume, using the distinct JD terms as the query.
+
+    Only JD terms are counted, so the term matrix is resumes x JD vocabulary
+    and stays small however large the resumes are.
+    """
+    query = sorted(set(tokenize(job_description)))
+    if not query or not resume_texts:
+        return np.zeros(len(resume_texts))
+    columns = {term: column for column, term in enumerate(query)}
+
+    tf = np.zeros((len(resume_texts), len(query)), dtype=np.float64)
+    lengths = np.zeros(len(resume_texts), dtype=np.float64)
+    for row, text in enumerate(resume_texts):
+        tokens = tokenize(text)
+        lengths[row] = len(tokens)
+        for term, count in Counter(tokens).items():
+            column = columns.get(term)
+            if column is not None:
+                tf[row, column] = count
+
+    n = len(resume_texts)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    avgdl = lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * lengths / avgdl)
+    weights = tf * (k1 + 1) / (tf + norm[:, None])
+    return weights @ idf
+
+class Prefilter:
+    """Keep the best `keep_percentile` percent of resumes by BM25, and drop any
+    whose score relative to the best resume is below `min_score` (0-1)."""
+
+    def __init__(self, keep_percentile=DEFAULT_KEEP_PERCENTILE, min_score=DEFAULT_MIN_SCORE,
+                 min_batch=DEFAULT_MIN_BATCH):
+        self.keep_percentile = keep_percentile
+        self.min_score = min_score
+        self.min_batch = min_batch
+
+    def select(self, job_description, resume_texts):
+        """Return (relative scores, boolean keep mask) for the given texts."""
+        scores = bm25_scores(job_description, resume_texts)
+        best = scores.max() if len(scores) else 0.0
+        relative = scores / best if best > 0 else np.zeros_like(scores)
+        if len(resume_texts) < self.min_batch:
+            return relative, np.ones(len(resume_texts), dtype=bool)
+        keep_count = max(1, math.ceil(len(resume_texts) * self.keep_percentile / 100))
+        # Stable descending order so equal scores keep upload order
+        order = np.argsort(-relative, kind="stable")
+        keep = np.zeros(len(resume_texts), dtype=bool)
+        keep[order[:keep_count]] = True
+        keep &= relative >= self.min_score
+        return relative, keep
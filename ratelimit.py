@@ -0,0 +1,185 @@
+"""Client-side rate limiting for OpenAI calls shared by every batch using one API key."""
+import os
+import random
+import threading
+import time
+
+import openai
+
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("RESUME_RATE_LIMIT_RPM", "500"))
+DEFAULT_TOKENS_PER_MINUTE = float(os.getenv("RESUME_RATE_LIMIT_TPM", "200000"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("RESUME_RATE_LIMIT_MAX_CONCURRENCY", "32"))
+DEFAULT_MAX_RETRIES = int(os.getenv("RESUME_RATE_LIMIT_MAX_RETRIES", "6"))
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] ("full jitter")
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 30.0
+# A call this many times slower than the best smoothed latency counts as congestion
+LATENCY_CONGESTION_FACTOR = 3.0
+
+# Errors worth retrying; anything else (bad key, bad request) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+def retry_after_seconds(error):
+    """Server-requested delay from a Retry-After / retry-after-ms header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to our own backoff
+    return None
+
+class TokenBucket:
+    """Allow `per_minute` units per minute with bursts up to one minute's worth.
+
+    A rate of 0 disables the bucket.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1.0):
+        """Block until `amount` units are available, then take them."""
+        if not self.rate:
+            return
+        # A single request bigger than the bucket would never fit; let it drain the bucket
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill(time.monotonic())
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                wait = (amount - self.level) / self.rate
+            time.sleep(wait)
+
+    def refund(self, amount):
+        """Return units taken by an estimate that turned out too high."""
+        if not self.rate or amount <= 0:
+            return
+        with self.lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+class AdaptiveLimiter:
+    """Token buckets for requests and tokens per minute plus an AIMD concurrency limit.
+
+    The concurrency limit grows by one per window of successful calls and is
+    halved on a 429 or cut by a quarter when latency climbs well above the best
+    seen, at most once per smoothed round trip. Retryable errors are retried
+    with jittered exponential backoff, honouring Retry-After, during which all
+    callers pause.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 min_concurrency=1, initial_concurrency=4, max_retries=DEFAULT_MAX_RETRIES):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latency = None
+        self.best_latency = None
+        self.last_decrease = 0.0
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0}
+        self.condition = threading.Condition()
+
+    def _acquire_slot(self):
+        with self.condition:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self.condition.wait(timeout=pause if pause > 0 else None)
+
+    def _release_slot(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def _decrease(self, factor):
+        """Multiplicative decrease, at most once per smoothed round trip. Caller holds the lock."""
+        now = time.monotonic()
+        if now - self.last_decrease < (self.latency or 0.0):
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit * factor)
+
+    def on_success(self, latency):
+        with self.condition:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.best_latency = min(self.best_latency or self.latency, self.latency)
+            if self.latency > LATENCY_CONGESTION_FACTOR * self.best_latency:
+                self._decrease(0.75)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+    def on_rate_limited(self, retry_after=None):
+        with self.condition:
+            self.stats["rate_limited"] += 1
+            self._decrease(0.5)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def backoff(self, attempt, error):
+        """Seconds to wait before retry `attempt` (0-based) after `error`."""
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def call(self, func, tokens=0):
+        """Run func() under the limits, retrying retryable OpenAI errors.
+
+        `tokens` is the estimated prompt + completion size charged to the
+        tokens-per-minute bucket, once however many attempts it takes (a
+        rejected request uses no tokens); callers can refund an over-estimate
+        once the real usage is known with tokens.refund().
+        """
+        self.tokens.acquire(tokens)
+        for attempt in range(self.max_retries + 1):
+            self.requests.acquire(1)
+            self._acquire_slot()
+            started = time.monotonic()
+            try:
+                result = func()
+            except RETRYABLE_ERRORS as e:
+                self._release_slot()
+                if isinstance(e, openai.RateLimitError):
+                    self.on_rate_limited(retry_after_seconds(e))
+                if attempt == self.max_retries:
+                    raise
+                with self.condition:
+                    self.stats["retries"] += 1
+                time.sleep(self.backoff(attempt, e))
+                continue
+            except BaseException:
+                self._release_slot()
+                raise
+            self._release_slot()
+            self.on_success(time.monotonic() - started)
+            with self.condition:
+                self.stats["calls"] += 1
+            return result
@@ -0,0 +1,91 @@
+"""Ranking table and plain-text report built from analysis results."""
+from datetime import datetime
+
+import pandas as pd
+
+from usage import usage_totals
+
+def build_summary_table(results):
+    """Summary DataFrame with a numeric match score, ranked by a stable sort on it.
+
+    Scores are parsed from the "NN%" strings in one vectorised pass, so sorting
+    the table in the UI is numeric ("85%" above "9%").
+    """
+    df = pd.DataFrame({
+        "Resume": [result.get("filename", "Unknown") for result in results],
+        "Match %": [result.get("JD Match", "0%") for result in results],
+        "Cached": [bool(result.get("cached")) for result in results],
+        "Parser": [result.get("extractor") or "-" for result in results],
+        "Tokens": pd.array([result["usage"].get("total_tokens") if result.get("usage") else None
+                            for result in results], dtype="Int64"),
+        "Cost ($)": [result["usage"].get("cost_usd") if result.get("usage") else None
+                     for result in results],
+        "Missing Keywords": [
+            ", ".join(result["MissingKeywords"]) if result.get("MissingKeywords") else "None"
+            for result in results
+        ]
+    })
+    df["Cost ($)"] = df["Cost ($)"].astype("float64")
+    df["Match %"] = pd.to_numeric(
+        df["Match %"].astype(str).str.strip().str.rstrip("%"), errors="coerce"
+    ).fillna(0.0).astype("float64")
+    df = df.sort_values("Match %", ascending=False, kind="stable", ignore_index=True)
+    df.insert(0, "Rank", pd.array(range(1, len(df) + 1), dtype="Int64"))
+    df["Resume"] = df["Resume"].astype("category")
+    df["Parser"] = df["Parser"].astype("category")
+    return df
+
+def format_usage(usage):
+    """One-line description of a usage dict (or of usage_totals)."""
+    cost = usage.get("cost_usd")
+    return (f"{usage.get('prompt_tokens', 0):,} prompt tokens "
+            f"({usage.get('cached_tokens', 0):,} cached), "
+            f"{usage.get('completion_tokens', 0):,} completion tokens, "
+            + (f"${cost:.4f}" if cost is not None else "cost unknown"))
+
+def iter_analysis_report(results):
+    """Yield the report in chunks: a header, then one chunk per resume."""
+    totals = usage_totals(results)
+    yield (
+        "Resume Analysis Report\n"
+        + "=" * 50 + "\n"
+        + f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        + f"API usage: {totals['calls']} calls, {format_usage(totals)}\n\n"
+    )
+
+    for i, result in enumerate(results, 1):
+        lines = [
+            f"Resume #{i}: {result.get('filename', 'Unknown')}",
+            "-" * 50,
+            f"Match Score: {result.get('JD Match', '0%')}",
+            "",
+            "Profile Summary:",
+            f"{result.get('Profile Summary', 'No summary available')}",
+            "",
+            "Missing Keywords:"
+        ]
+        keywords = result.get('MissingKeywords', [])
+        if keywords:
+            lines.extend(f"- {keyword}" for keyword in keywords)
+        else:
+            lines.append("None")
+        lines.append("")
+
+        lines.append("Suggestions:")
+        lines.extend(f"- {suggestion}" for suggestion in result.get('Suggestions', []))
+        lines.append("")
+        if result.get("usage"):
+            lines.append(f"Usage: {format_usage(result['usage'])}")
+            lines.append("")
+        lines.append("=" * 50)
+        lines.append("\n")
+        yield "\n".join(lines)
+
+def write_analysis_report(results, fp):
+    """Stream the report into a text file object."""
+    for chunk in iter_analysis_report(results):
+        fp.write(chunk)
+
+def create_analysis_report(results):
+    """Create a formatted text report from analysis results."""
+    return "".join(iter_analysis_report(results))
@@ -0,0 +1,70 @@
+"""SQLite-backed cache of LLM analysis results."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "RESUME_RESULT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_analyser", "results.sqlite3")
+)
+DEFAULT_TTL = float(os.getenv("RESUME_RESULT_CACHE_TTL", str(7 * 24 * 3600)))
+
+def make_key(resume_text, job_key, model, prompt_version):
+    """Cache key from content hashes of the resume and JD plus model and prompt version.
+
+    job_key is the job description text, or any string that identifies it
+    (such as the digest of its compiled form).
+    """
+    resume_hash = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    jd_hash = hashlib.sha256(job_key.strip().encode("utf-8")).hexdigest()
+    return f"{resume_hash}:{jd_hash}:{model}:{prompt_version}"
+
+class ResultCache:
+    """Analysis results that expire after a TTL, shared by all threads of the app."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        """Return a cached result dict, or None when missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        result, created = row
+        if self.ttl and time.time() - created > self.ttl:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        return json.loads(result)
+
+    def put(self, key, result):
+        """Store a result dict under key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, result, created) VALUES (?, ?, ?)",
+                (key, json.dumps(result), time.time())
+            )
+
+    def purge_expired(self):
+        """Delete every expired entry."""
+        if not self.ttl:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl,))
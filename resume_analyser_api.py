@@ -0,0 +1,341 @@
+"""HTTP job API for batch resume analysis, served with the standard library.
+
+    python resume_analyser_api.py --port 8080 --workers 2
+
+    POST /jobs                  {"job_description": "...",
+                                 "resumes": [{"filename": "a.pdf", "content": "<base64>"}],
+                                 "job_id": "optional"}
+                                -> 202 {"job_id": ..., "status_url": ...}
+    GET  /jobs/<id>             status and progress
+    GET  /jobs/<id>/results     results finished so far, ranked
+    GET  /jobs/<id>/report      text report once the job is done
+    GET  /jobs/<id>/timings     per-stage latency percentiles so far
+
+Jobs wait in a bounded queue and are run by a fixed pool of job workers, each
+of which analyses its resumes concurrently through the shared BatchEngine
+settings. Each job checkpoints finished resumes in a journal; resubmitting
+the same job (same inputs, or the same explicit job_id) after a failure or a
+server restart only analyses what is left, and resubmitting a job that is
+still queued or running returns it instead of starting another. The OpenAI key is read from OPENAI_API_KEY (or .env); set
+RESUME_API_TOKEN to require "Authorization: Bearer <token>".
+"""
+import argparse
+import base64
+import binascii
+import hmac
+import io
+import json
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+from analyzer import PipelineAnalyzer
+from batch import DEFAULT_MAX_IN_FLIGHT, BatchEngine, is_error_result, rank_results
+from extraction import ExtractionPool
+from jd import compile_job_description
+from journal import DEFAULT_JOURNAL_DIR, Journal, make_job_id
+from ratelimit import AdaptiveLimiter
+from report import create_analysis_report
+from result_cache import ResultCache
+from text_cache import TextCache, content_hash, read_bytes
+from timing import stage_timings
+from usage import UsageLedger, ledger_entry, usage_totals
+
+DEFAULT_WORKERS = int(os.getenv("RESUME_API_WORKERS", "2"))
+DEFAULT_MAX_QUEUED = int(os.getenv("RESUME_API_MAX_QUEUED", "100"))
+# Finished jobs kept for polling; the oldest are forgotten first
+DEFAULT_MAX_FINISHED = int(os.getenv("RESUME_API_MAX_FINISHED", "500"))
+JOB_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+MAX_BODY_BYTES = int(os.getenv("RESUME_API_MAX_BODY_BYTES", str(200 * 1024 * 1024)))
+
+class Job:
+    """One submitted batch: its inputs, progress and results."""
+
+    def __init__(self, job_id, engine, job_description, resume_files):
+        self.id = job_id
+        self.engine = engine
+        self.job_description = job_description
+        self.resume_files = resume_files
+        self.total = len(resume_files)
+        self.status = "queued"
+        self.error = None
+        self.results = []
+        self.created = datetime.now()
+        self.started = None
+        self.finished = None
+        self.lock = threading.Lock()
+
+    def summary(self):
+        with self.lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "completed": len(self.results),
+                "failed": sum(1 for result in self.results if is_error_result(result)),
+                "resumed": sum(1 for result in self.results if result.get("resumed")),
+                "usage": usage_totals(self.results),
+                "created": self.created.isoformat(timespec="seconds"),
+                "started": self.started and self.started.isoformat(timespec="seconds"),
+                "finished": self.finished and self.finished.isoformat(timespec="seconds"),
+                "error": self.error
+            }
+
+    def ranked_results(self):
+        with self.lock:
+            return rank_results(self.results)
+
+class JobQueue:
+    """Bounded queue of jobs run by `workers` threads, each with its own BatchEngine.
+
+    make_engine() returns a new BatchEngine; each job's engine gets a journal.
+    Finished jobs are recorded in the usage ledger when one is given.
+    """
+
+    def __init__(self, make_engine, workers=DEFAULT_WORKERS, max_queued=DEFAULT_MAX_QUEUED,
+                 max_finished=DEFAULT_MAX_FINISHED, journal_dir=DEFAULT_JOURNAL_DIR, ledger=None):
+        self.make_engine = make_engine
+        self.ledger = ledger
+        self.journal_dir = journal_dir
+        self.pending = queue.Queue(maxsize=max_queued)
+        self.jobs = OrderedDict()
+        self.max_finished = max_finished
+        self.lock = threading.Lock()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, job_description, resume_files, job_id=None):
+        """Queue a job and return it; raises queue.Full when the backlog is at its limit.
+
+        Without a job_id one is derived from the JD, settings and resume
+        contents. A job with that id that has not finished yet is returned as is.
+        """
+        engine = self.make_engine()
+        job_id = job_id or make_job_id(
+            engine.fingerprint(job_description),
+            [content_hash(read_bytes(file)) for _, file in resume_files]
+        )
+        engine.journal = Journal(job_id, self.journal_dir)
+        job = Job(job_id, engine, job_description, resume_files)
+        with self.lock:
+            existing = self.jobs.get(job_id)
+            if existing is not None and existing.finished is None:
+                return existing
+            self.pending.put_nowait(job)
+            self.jobs.pop(job_id, None)
+            self.jobs[job.id] = job
+            self._forget_finished()
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self.pending.get()
+            with job.lock:
+                job.status = "running"
+                job.started = datetime.now()
+            try:
+                for result in job.engine.iter_results(job.resume_files, job.job_description):
+                    with job.lock:
+                        job.results.append(result)
+                status, error = "done", None
+            except Exception as e:
+                print(f"Error processing job {job.id}: {str(e)}")
+                status, error = "failed", str(e)
+            with job.lock:
+                job.status = status
+                job.error = error
+                job.finished = datetime.now()
+                job.resume_files = []  # release the uploaded bytes
+            if self.ledger is not None:
+                # A ledger problem (full disk, ...) must not take the worker down
+                try:
+                    analyzer = job.engine.analyzer
+                    self.ledger.record(ledger_entry(
+                        job.results, analyzer.model, getattr(analyzer, "prompt_version", None),
+                        compile_job_description(job.job_description).digest, job.id
+                    ))
+                except Exception as e:
+                    print(f"Error recording usage of job {job.id}: {str(e)}")
+            self.pending.task_done()
+
+def parse_job(body):
+    """Validate a POST /jobs body; returns (job_description, [(filename, file)], job_id)."""
+    try:
+        payload = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Body is not valid JSON: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("Body must be a JSON object")
+    job_description = payload.get("job_description")
+    if not isinstance(job_description, str) or not job_description.strip():
+        raise ValueError("job_description must be a non-empty string")
+    resumes = payload.get("resumes")
+    if not isinstance(resumes, list) or not resumes:
+        raise ValueError("resumes must be a non-empty list")
+    resume_files = []
+    for i, resume in enumerate(resumes):
+        if not isinstance(resume, dict) or not isinstance(resume.get("content"), str):
+            raise ValueError(f"resumes[{i}] must be an object with base64 'content'")
+        try:
+            data = base64.b64decode(resume["content"], validate=True)
+        except binascii.Error:
+            raise ValueError(f"resumes[{i}].content is not valid base64")
+        filename = str(resume.get("filename") or f"resume_{i + 1}")
+        resume_files.append((filename, io.BytesIO(data)))
+    job_id = payload.get("job_id")
+    if job_id is not None and not (isinstance(job_id, str) and JOB_ID.fullmatch(job_id)):
+        raise ValueError("job_id must be 1-64 letters, digits, '-' or '_'")
+    return job_description, resume_files, job_id
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes for the job API; `server.jobs` is the JobQueue."""
+
+    server_version = "ResumeAnalyser/1"
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, {"error": message})
+
+    def authorized(self):
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {token}"):
+            self.send_error_json(HTTPStatus.UNAUTHORIZED, "Missing or wrong bearer token")
+            return False
+        return True
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        if self.path.rstrip("/") != "/jobs":
+            return self.send_error_json(HTTPStatus.NOT_FOUND, "Not found")
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self.send_error_json(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header")
+        if length > MAX_BODY_BYTES:
+            return self.send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        f"Body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            job_description, resume_files, job_id = parse_job(self.rfile.read(length))
+        except ValueError as e:
+            return self.send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+        try:
+            job = self.server.jobs.submit(job_description, resume_files, job_id)
+        except queue.Full:
+            return self.send_error_json(HTTPStatus.SERVICE_UNAVAILABLE, "Job queue is full, retry later")
+        self.send_json(HTTPStatus.ACCEPTED, {"job_id": job.id, "status_url": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if parts == ["health"]:
+            return self.send_json(HTTPStatus.OK, {"status": "ok"})
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            return self.send_error_json(HTTPStatus.NOT_FOUND, "Not found")
+        job = self.server.jobs.get(parts[1])
+        if job is None:
+            return self.send_error_json(HTTPStatus.NOT_FOUND, "Unknown job id")
+        view = parts[2] if len(parts) == 3 else None
+        if view is None:
+            self.send_json(HTTPStatus.OK, job.summary())
+        elif view == "results":
+            self.send_json(HTTPStatus.OK, dict(job.summary(), results=job.ranked_results()))
+        elif view == "timings":
+            with job.lock:
+                timings = stage_timings(job.results)
+            self.send_json(HTTPStatus.OK, timings.summary())
+        elif view == "report":
+            if job.status != "done":
+                return self.send_error_json(HTTPStatus.CONFLICT, f"Job is {job.status}")
+            body = create_analysis_report(job.ranked_results()).encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, "Not found")
+
+def make_server(host, port, jobs, token=None):
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.daemon_threads = True
+    server.jobs = jobs
+    server.token = token
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Jobs processed at the same time")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="Resumes analysed at the same time within one job")
+    parser.add_argument("--max-queued", type=int, default=DEFAULT_MAX_QUEUED,
+                        help="Jobs waiting beyond this are rejected with 503")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        parser.error("Set OPENAI_API_KEY")
+
+    # Shared by every job so rate limits, caches and parser processes are global
+    analyzer = PipelineAnalyzer(api_key, model=args.model, limiter=AdaptiveLimiter())
+    text_cache = TextCache()
+    result_cache = ResultCache()
+    result_cache.purge_expired()
+    extraction_pool = ExtractionPool()
+
+    def make_engine():
+        return BatchEngine(
+            analyzer,
+            max_in_flight=args.concurrency,
+            text_cache=text_cache,
+            result_cache=result_cache,
+            extraction_pool=extraction_pool,
+            warm_prompt_cache=True
+        )
+
+    jobs = JobQueue(make_engine, workers=args.workers, max_queued=args.max_queued,
+                    ledger=UsageLedger())
+    server = make_server(args.host, args.port, jobs, token=os.getenv("RESUME_API_TOKEN"))
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} job workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        extraction_pool.close()
+
+if __name__ == "__main__":
+    main()
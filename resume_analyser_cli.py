@@ -0,0 +1,204 @@
+"""Analyse a directory of resumes against a job description without Streamlit.
+
+    python resume_analyser_cli.py jd.txt resumes/ --jsonl results.jsonl --csv ranking.csv
+    python resume_analyser_cli.py jd.txt "inbox/**/*.pdf" --concurrency 16 --report report.txt
+
+The OpenAI key is read from --api-key, OPENAI_API_KEY or a .env file. Results
+are written to the JSONL file as each resume finishes; the CSV ranking and
+text report are written once the whole run is done.
+
+Every finished resume is checkpointed in a journal under a job id (printed at
+start, or set with --job-id). Running the same command again after a crash
+skips the resumes that already have results.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from analyzer import PipelineAnalyzer
+from batch import DEFAULT_MAX_IN_FLIGHT, BatchEngine, is_error_result, rank_results
+from compaction import DEFAULT_TOKEN_BUDGET
+from extraction import DEFAULT_PROCESSES, ExtractionPool
+from journal import Journal, make_job_id
+from prefilter import Prefilter
+from ratelimit import AdaptiveLimiter
+from jd import compile_job_description
+from report import build_summary_table, format_usage, write_analysis_report
+from result_cache import ResultCache
+from text_cache import TextCache
+from timing import stage_timings
+from usage import UsageLedger, ledger_entry, usage_totals
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+# Resumes handed to the engine at a time, so file bytes for a 10k-resume run
+# are never all held in memory at once
+CHUNK_SIZE = int(os.getenv("RESUME_CLI_CHUNK_SIZE", "256"))
+PROGRESS_EVERY_SECONDS = 5.0
+
+class ResumeFile:
+    """A resume on disk, read only when its bytes are needed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = path
+
+    def getvalue(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+def find_resumes(patterns):
+    """Resume paths from files, directories (searched recursively) and glob patterns."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.extend(path for path in matches
+                     if os.path.isfile(path) and path.lower().endswith(RESUME_EXTENSIONS))
+    return sorted(set(paths))
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def run(engine, paths, job_description, jsonl=None, log=sys.stderr):
+    """Analyse every path, streaming results to `jsonl`; returns all results, unranked."""
+    results = []
+    started = last_report = time.monotonic()
+    # Read the journal once for the whole run rather than once per chunk
+    done = engine.journal.load(engine.fingerprint(job_description)) if engine.journal else None
+    for number, chunk in enumerate(chunked(paths, CHUNK_SIZE)):
+        if number == 1:
+            # The first chunk already put the shared prompt prefix in the
+            # provider's cache; later chunks fan out straight away
+            engine.warm_prompt_cache = False
+        resume_files = [(path, ResumeFile(path)) for path in chunk]
+        for result in engine.iter_results(resume_files, job_description, done):
+            results.append(result)
+            if jsonl is not None:
+                jsonl.write(json.dumps(result, ensure_ascii=False) + "\n")
+                jsonl.flush()
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_EVERY_SECONDS or len(results) == len(paths):
+                last_report = now
+                print(f"Analysed {len(results)}/{len(paths)} resumes "
+                      f"({len(results) / (now - started):.1f}/s)", file=log)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("resumes", nargs="+", help="Resume files, directories or glob patterns")
+    parser.add_argument("--api-key", default=None, help="OpenAI API key (default: $OPENAI_API_KEY)")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="Maximum resumes analysed at the same time")
+    parser.add_argument("--processes", type=int, default=DEFAULT_PROCESSES,
+                        help="Extraction worker processes; 0 parses in the analysis threads")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the text and result caches")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET,
+                        help="Compact each resume to at most this many tokens (0 = no limit)")
+    parser.add_argument("--no-local-keywords", action="store_true",
+                        help="Ask the LLM for missing keywords instead of matching them locally")
+    parser.add_argument("--prefilter", type=float, metavar="PERCENT", default=None,
+                        help="Only send the top PERCENT of each chunk by local BM25 score to the LLM")
+    parser.add_argument("--job-id", help="Journal to resume; defaults to one derived from the inputs")
+    parser.add_argument("--no-journal", action="store_true", help="Don't checkpoint results")
+    parser.add_argument("--jsonl", help="Write one JSON result per line as resumes finish ('-' for stdout)")
+    parser.add_argument("--csv", help="Write the ranking table as CSV")
+    parser.add_argument("--report", help="Write the detailed text report")
+    parser.add_argument("--timings", help="Write per-stage latency percentiles as JSON")
+    parser.add_argument("--no-ledger", action="store_true",
+                        help="Don't append this run's token and cost totals to the usage ledger")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = args.api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        parser.error("No OpenAI API key: pass --api-key or set OPENAI_API_KEY")
+    with open(args.job_description, encoding="utf-8") as f:
+        job_description = f.read()
+    paths = find_resumes(args.resumes)
+    if not paths:
+        parser.error("No PDF or DOCX resumes matched " + " ".join(args.resumes))
+    print(f"{len(paths)} resumes found", file=sys.stderr)
+
+    analyzer = PipelineAnalyzer(
+        api_key,
+        model=args.model,
+        local_keywords=not args.no_local_keywords,
+        token_budget=args.token_budget,
+        limiter=AdaptiveLimiter(max_concurrency=args.concurrency)
+    )
+    result_cache = None
+    if not args.no_cache:
+        result_cache = ResultCache()
+        result_cache.purge_expired()
+    extraction_pool = ExtractionPool(args.processes) if args.processes > 0 else None
+    engine = BatchEngine(
+        analyzer,
+        max_in_flight=args.concurrency,
+        text_cache=None if args.no_cache else TextCache(),
+        result_cache=result_cache,
+        extraction_pool=extraction_pool,
+        prefilter=Prefilter(keep_percentile=args.prefilter) if args.prefilter is not None else None,
+        warm_prompt_cache=len(paths) > 1
+    )
+    job_id = None
+    if not args.no_journal:
+        # Paths rather than content hashes, so starting a 10k run reads no files
+        job_id = args.job_id or make_job_id(engine.fingerprint(job_description),
+                                            [os.path.abspath(path) for path in paths])
+        engine.journal = Journal(job_id)
+        print(f"Job id {job_id} (journal: {engine.journal.path})", file=sys.stderr)
+
+    jsonl = None
+    if args.jsonl == "-":
+        jsonl = sys.stdout
+    elif args.jsonl:
+        jsonl = open(args.jsonl, "w", encoding="utf-8")
+    try:
+        results = run(engine, paths, job_description, jsonl)
+    finally:
+        if jsonl not in (None, sys.stdout):
+            jsonl.close()
+        if extraction_pool is not None:
+            extraction_pool.close()
+
+    if not args.no_ledger:
+        UsageLedger().record(ledger_entry(
+            results, analyzer.model, analyzer.prompt_version,
+            compile_job_description(job_description).digest, job_id
+        ))
+    timings = stage_timings(results)
+    with timings.span("rank"):
+        results = rank_results(results)
+    if args.csv:
+        with timings.span("summary"):
+            build_summary_table(results).to_csv(args.csv, index=False)
+    if args.report:
+        with timings.span("report"), open(args.report, "w", encoding="utf-8") as f:
+            write_analysis_report(results, f)
+    if args.timings:
+        with open(args.timings, "w", encoding="utf-8") as f:
+            f.write(timings.to_json())
+
+    failed = sum(1 for result in results if is_error_result(result))
+    resumed = sum(1 for result in results if result.get("resumed"))
+    print(f"Done: {len(results) - failed} analysed ({resumed} from the journal), {failed} failed",
+          file=sys.stderr)
+    totals = usage_totals(results)
+    print(f"API usage: {totals['calls']} calls, {format_usage(totals)}", file=sys.stderr)
+    for rank, result in enumerate(results[:10], 1):
+        print(f"{rank:>3}. {result.get('JD Match', '0%'):>5}  {result['filename']}", file=sys.stderr)
+    return 1 if failed == len(results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,350 @@
-import streamlit as st
-from wyge.prebuilt_agents.resume_analyser import ResumeAnalyzer
 import pandas as pd
+import streamlit as st
+from analyzer import PipelineAnalyzer
 import json
+import hashlib
+import os
+import time
 from datetime import datetime
+from batch import (
+    BatchEngine, DEFAULT_MAX_IN_FLIGHT, RUN_FIELDS, TopK, is_error_result, prefiltered_result,
+    prompt_cache_stats, rank_results
+)
+from text_cache import TextCache, content_hash, read_bytes
+from result_cache import ResultCache
+from extraction import ExtractionPool
+from report import build_summary_table, create_analysis_report, format_usage
+from prefilter import Prefilter, DEFAULT_KEEP_PERCENTILE, DEFAULT_MIN_SCORE
+from jd import compile_job_description
+from compaction import DEFAULT_TOKEN_BUDGET, compaction_stats
+from ratelimit import AdaptiveLimiter
+from journal import DEFAULT_JOURNAL_DIR, Journal, make_job_id, purge_expired
+from timing import StageTimings, timed
+from usage import UsageLedger, ledger_entry, usage_totals
+
+DEFAULT_MODEL = "gpt-4o-mini"
+# Minimum seconds between redraws of the live ranking while a batch runs
+LIVE_REFRESH_SECONDS = 1.0
+# Resumes that get a detailed expander; the rest are shown on demand
+DEFAULT_TOP_K = 25
+
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter(key_hash):
+    """One limiter per API key, shared by every session and analyzer using that key."""
+    return AdaptiveLimiter()
+
+@st.cache_resource(max_entries=8, ttl="1h", show_spinner=False)
+def _build_analyzer(key_hash, model, local_keywords, token_budget, _api_key):
+    """Create one analyzer per (API key hash, model settings).
+
+    Streamlit keeps the instance across reruns and sessions, so the OpenAI
+    client and its connection pool stay warm. The raw key is not part of
+    the cache key; least recently used entries are evicted.
+    """
+    return PipelineAnalyzer(_api_key, model=model, local_keywords=local_keywords,
+                            token_budget=token_budget, limiter=get_rate_limiter(key_hash))
+
+def get_analyzer(api_key, model=DEFAULT_MODEL, local_keywords=True,
+                 token_budget=DEFAULT_TOKEN_BUDGET):
+    """Return a cached analyzer for the given key and settings."""
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    return _build_analyzer(key_hash, model, local_keywords, token_budget, api_key)
+
+@st.cache_resource
+def get_text_cache():
+    """Shared on-disk cache of extracted resume text."""
+    return TextCache()
+
+@st.cache_resource
+def get_result_cache():
+    """Shared SQLite cache of analysis results; expired rows are cleared once per process."""
+    cache = ResultCache()
+    cache.purge_expired()
+    return cache
+
+@st.cache_resource
+def get_journal_dir():
+    """Directory of batch journals; old ones are cleared once per process."""
+    purge_expired(DEFAULT_JOURNAL_DIR)
+    return DEFAULT_JOURNAL_DIR
+
+@st.cache_resource
+def get_usage_ledger():
+    """Append-only record of tokens and cost per batch."""
+    return UsageLedger()
+
+@st.cache_resource
+def get_extraction_pool():
+    """Worker processes shared by every batch for PDF/DOCX parsing."""
+    return ExtractionPool()
+
+def get_session_results(job_description, analyzer):
+    """Results already produced in this session, keyed by resume content hash.
+
+    The store is reset whenever the job description, model or prompt changes.
+    """
+    settings = f"{analyzer.model}\n{getattr(analyzer, 'prompt_version', '')}"
+    jd_key = hashlib.sha256(f"{settings}\n{job_description.strip()}".encode()).hexdigest()
+    if st.session_state.get("analysed_jd") != jd_key:
+        st.session_state["analysed_jd"] = jd_key
+        st.session_state["analysed"] = {}
+    return st.session_state["analysed"]
+
+def get_prefilter_decisions(engine, prefilter, files_by_digest, job_description, timings):
+    """{digest: (relative score, kept, backend)} for every distinct upload.
+
+    All uploads are scored as one set, so the percentile cut-off means the
+    same on every click. Decisions are kept in the session together with the
+    prefilter settings and the upload set, and are only recomputed when
+    either changes.
+    """
+    settings = repr((prefilter.keep_percentile, prefilter.min_score, prefilter.min_batch))
+    key = hashlib.sha256("\n".join(
+        [st.session_state.get("analysed_jd", ""), job_description.strip(), settings]
+        + sorted(files_by_digest)
+    ).encode()).hexdigest()
+    stored = st.session_state.get("prefilter_decisions")
+    if stored is not None and stored["key"] == key:
+        return stored["decisions"]
+
+    digests = list(files_by_digest)
+    decisions = {}
+    with timings.span("prefilter"):
+        for index, _, _, backend, spans, score, kept in engine.prefilter_extracted(
+                [(files[0].name, files[0]) for files in files_by_digest.values()],
+                job_description, prefilter):
+            timings.add_result({"timings": spans})
+            decisions[digests[index]] = (score, kept, backend)
+    st.session_state["prefilter_decisions"] = {"key": key, "decisions": decisions}
+    return decisions
 
-def create_analysis_report(results):
-    """Create a formatted text report from analysis results."""
-    report = "Resume Analysis Report\n"
-    report += "=" * 50 + "\n"
-    report += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-    for i, result in enumerate(results, 1):
-        report += f"Resume #{i}: {result.get('filename', 'Unknown')}\n"
-        report += "-" * 50 + "\n"
-        report += f"Match Score: {result.get('JD Match', '0%')}\n\n"
-        
-        report += "Profile Summary:\n"
-        report += f"{result.get('Profile Summary', 'No summary available')}\n\n"
-        
-        report += "Missing Keywords:\n"
-        keywords = result.get('MissingKeywords', [])
-        if keywords:
-            for keyword in keywords:
-                report += f"- {keyword}\n"
+def analyze_incrementally(engine, uploaded_files, job_description, on_progress=None,
+                          top_k=DEFAULT_TOP_K, timings=None, prefilter=None):
+    """Analyse only uploads that are new or changed since the last click, then re-rank.
+
+    Returns the ranked results for the current upload list and the number of
+    resumes that actually had to be analysed. If given, on_progress(completed,
+    total, top) is called after every finished resume with the current best
+    `top_k` results, tracked in a bounded heap rather than by re-sorting.
+    The stage timings of newly analysed resumes and of the ranking go into
+    `timings` (a StageTimings) when given. With a prefilter, only uploads it
+    keeps (see get_prefilter_decisions) are sent to the LLM.
+    """
+    timings = timings if timings is not None else StageTimings()
+    analysed = get_session_results(job_description, engine.analyzer)
+    digests = [content_hash(read_bytes(file)) for file in uploaded_files]
+    # Files removed from the uploader drop out; renamed files keep their result
+    files_by_digest = {}
+    for digest, file in zip(digests, uploaded_files):
+        files_by_digest.setdefault(digest, []).append(file)
+
+    decisions = {}
+    if prefilter is not None:
+        decisions = get_prefilter_decisions(engine, prefilter, files_by_digest, job_description,
+                                            timings)
+
+    top = TopK(top_k)
+    pending = {}
+    fresh = {}
+    for digest, files in files_by_digest.items():
+        score, kept, backend = decisions.get(digest, (None, True, None))
+        if digest in analysed:
+            for file in files:
+                top.push(dict(analysed[digest], filename=file.name))
+        elif not kept:
+            fresh[digest] = prefiltered_result(files[0].name, score, backend)
+            for file in files:
+                top.push(dict(fresh[digest], filename=file.name))
         else:
-            report += "None\n"
-        report += "\n"
-        
-        report += "Suggestions:\n"
-        suggestions = result.get('Suggestions', [])
-        for suggestion in suggestions:
-            report += f"- {suggestion}\n"
-        report += "\n" + "=" * 50 + "\n\n"
+            pending[digest] = files[0]
+
+    if pending:
+        pending_digests = list(pending)
+        resume_files = [(file.name, file) for file in pending.values()]
+        for completed, (index, result) in enumerate(
+                engine.iter_indexed(resume_files, job_description), 1):
+            digest = pending_digests[index]
+            fresh[digest] = result
+            timings.add_result(result)
+            # Failures are shown but not remembered, so the next click retries
+            # them; reuse must not report this run's tokens
+            if not is_error_result(result):
+                analysed[digest] = {k: v for k, v in result.items() if k not in RUN_FIELDS}
+            for file in files_by_digest[digest]:
+                top.push(dict(result, filename=file.name))
+            if on_progress is not None:
+                on_progress(completed, len(pending), top)
+
+    with timings.span("rank"):
+        results = rank_results(
+            dict(fresh.get(digest) or analysed[digest], filename=file.name)
+            for digest, file in zip(digests, uploaded_files)
+        )
+    return results, len(pending)
+
+def render_single_result(result):
+    """Show the analysis of a single resume."""
+    st.success("Analysis completed!")
+    if result.get("extractor"):
+        st.caption(f"Parsed with {result['extractor']}")
+    if result.get("cached"):
+        st.caption("⚡ Served from cache, no API call made")
+    elif result.get("usage"):
+        usage = result["usage"]
+        st.caption(f"API usage: {format_usage(usage)}")
+    if result.get("compaction"):
+        compaction = result["compaction"]
+        st.caption(f"Resume compacted from {compaction['tokens_before']:,} to "
+                   f"{compaction['tokens_after']:,} tokens"
+                   + (" (truncated to the token budget)" if compaction["truncated"] else ""))
+    
+    col1, col2 = st.columns(2)
     
-    return report
+    with col1:
+        st.metric("Job Description Match", result["JD Match"])
+    
+    with col2:
+        st.subheader("Missing Keywords")
+        if result["MissingKeywords"]:
+            for keyword in result["MissingKeywords"]:
+                st.write("•", keyword)
+        else:
+            st.write("No missing keywords found")
+    
+    st.subheader("Profile Summary")
+    st.info(result["Profile Summary"])
+    
+    st.subheader("Suggestions")
+    for suggestion in result["Suggestions"]:
+        st.warning("• " + suggestion)
+
+def render_batch_results(analysis):
+    """Show ranking, report download and per-resume details of a stored batch analysis."""
+    results = analysis["results"]
+    analysed_count = analysis["analysed_count"]
+    st.success(f"Successfully analyzed {len(results)} resumes!")
+    if analysed_count < len(results):
+        st.caption(f"{analysed_count} new or changed resume(s) analysed, "
+                   f"{len(results) - analysed_count} reused from this session")
+    cache_hits = sum(1 for result in results if result.get("cached"))
+    if cache_hits:
+        st.caption(f"⚡ {cache_hits} of {len(results)} results served from cache")
+    skipped = sum(1 for result in results if result.get("prefiltered"))
+    if skipped:
+        st.caption(f"🔎 {skipped} of {len(results)} resumes skipped by the local prefilter")
+    resumed = sum(1 for result in results if result.get("resumed"))
+    if resumed:
+        st.caption(f"↩️ {resumed} results recovered from the checkpoint of an interrupted run "
+                   f"(job {analysis.get('job_id')})")
+    totals = usage_totals(results)
+    if totals["calls"]:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("API calls", f"{totals['calls']:,}")
+        col2.metric("Tokens", f"{totals['total_tokens']:,}")
+        col3.metric("Estimated cost",
+                    f"${totals['cost_usd']:.4f}" if totals["cost_usd"] is not None else "Unknown")
+    prompt_cache = prompt_cache_stats(results)
+    if prompt_cache["calls"]:
+        st.caption(f"Provider prompt cache: {prompt_cache['cached_tokens']:,} of "
+                   f"{prompt_cache['prompt_tokens']:,} prompt tokens cached "
+                   f"({prompt_cache['hit_rate']:.0%}) over {prompt_cache['calls']} API calls")
+    compaction = compaction_stats(results)
+    if compaction["tokens_saved"]:
+        st.caption(f"Compaction saved {compaction['tokens_saved']:,} of "
+                   f"{compaction['tokens_before']:,} resume tokens "
+                   f"({compaction['bytes_saved']:,} bytes); "
+                   f"{compaction['truncated']} resume(s) truncated to the token budget")
+    if analysis.get("first_result_seconds") is not None:
+        st.caption(f"First result after {analysis['first_result_seconds']:.1f}s, "
+                   f"batch finished after {analysis['total_seconds']:.1f}s")
+    
+    def build_report():
+        with analysis["timings"].span("report"):
+            return create_analysis_report(results)
+
+    # Add download button for detailed analysis; the report is only built when clicked
+    st.download_button(
+        label="Download Detailed Analysis Report",
+        data=build_report,
+        file_name=f"resume_analysis_{analysis['generated'].strftime('%Y%m%d_%H%M%S')}.txt",
+        mime="text/plain"
+    )
+    
+    top_k = analysis.get("top_k", DEFAULT_TOP_K)
+    ledger = get_usage_ledger()
+    # The ledger grows with every batch; only read it when the download is clicked
+    if os.path.exists(ledger.path):
+        st.download_button(
+            label="Download usage ledger (all batches)",
+            data=lambda: pd.DataFrame(ledger.read()).to_csv(index=False),
+            file_name="resume_analysis_usage_ledger.csv",
+            mime="text/csv"
+        )
+    
+    render_ranking(results[:top_k], analysis["summary"])
+    
+    # Only the top K get expanders up front; the long tail is rendered on request
+    if len(results) > top_k:
+        if st.toggle(f"Show details for the remaining {len(results) - top_k} resumes", key="show_tail"):
+            render_details(results[top_k:], start=top_k + 1)
+
+def render_performance(timings):
+    """Per-stage latency percentiles, with a JSON export."""
+    summary = timings.summary()
+    with st.expander("Performance"):
+        if not summary:
+            st.write("No timings recorded")
+            return
+        st.dataframe(
+            pd.DataFrame.from_dict(summary, orient="index").rename_axis("Stage").reset_index(),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                column: st.column_config.NumberColumn(format="%.3f s")
+                for column in ("total", "p50", "p95", "p99", "max")
+            }
+        )
+        st.caption("Per-resume stages cover newly analysed resumes only; rank, summary, "
+                   "render and report are per batch or per rerun")
+        st.download_button(
+            label="Download timings (JSON)",
+            data=timings.to_json(),
+            file_name="resume_analysis_timings.json",
+            mime="application/json"
+        )
+
+def render_ranking(results, summary):
+    """Show the ranking table and an expander for each of the given results."""
+    # Display summary table
+    st.subheader("Resume Ranking")
+    st.dataframe(
+        summary,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Match %": st.column_config.NumberColumn(format="%.0f%%")}
+    )
+    
+    # Detailed results in expandable sections
+    st.subheader("Detailed Analysis")
+    render_details(results)
+
+def render_details(results, start=1):
+    """One expander per result, numbered from `start`."""
+    for i, result in enumerate(results, start):
+        with st.expander(f"#{i}: {result.get('filename', 'Unknown')} - {result.get('JD Match', '0%')} Match"):
+            st.subheader("Profile Summary")
+            st.info(result.get("Profile Summary", "No summary available"))
+            
+            st.subheader("Missing Keywords")
+            if result.get("MissingKeywords"):
+                for keyword in result.get("MissingKeywords"):
+                    st.write("•", keyword)
+            else:
+                st.write("No missing keywords found")
+            
+            st.subheader("Suggestions")
+            for suggestion in result.get("Suggestions", []):
+                st.warning("• " + suggestion)
 
 def main():
     st.title("Resume ATS Analysis")
@@ -44,8 +355,62 @@ def main():
         st.warning("Please enter your OpenAI API key.")
         return
     
-    # Initialize analyzer
-    analyzer = ResumeAnalyzer(api_key)
+    local_keywords = st.sidebar.checkbox(
+        "Compute missing keywords locally",
+        value=True,
+        help="Match job description terms against each resume locally instead of asking the LLM"
+    )
+
+    token_budget = st.sidebar.number_input(
+        "Resume token budget",
+        min_value=0,
+        value=DEFAULT_TOKEN_BUDGET,
+        step=500,
+        help="Compact each resume to at most this many tokens before scoring (0 = no limit)"
+    )
+
+    # Reuse the analyzer (and its HTTP client) across reruns
+    analyzer = get_analyzer(api_key, local_keywords=local_keywords, token_budget=token_budget)
+    text_cache = get_text_cache()
+    result_cache = get_result_cache()
+    limiter = getattr(analyzer, "limiter", None)
+    if limiter is not None:
+        st.sidebar.caption(f"API concurrency limit: {int(limiter.limit)} "
+                           f"({limiter.stats['rate_limited']} rate-limit responses, "
+                           f"{limiter.stats['retries']} retries so far)")
+
+    max_in_flight = st.sidebar.slider(
+        "Concurrent analyses",
+        min_value=1,
+        max_value=32,
+        value=min(DEFAULT_MAX_IN_FLIGHT, 32),
+        help="Maximum number of resumes extracted and scored at the same time"
+    )
+    top_k = st.sidebar.number_input(
+        "Detailed results (top K)",
+        min_value=1,
+        value=DEFAULT_TOP_K,
+        help="Only the best K resumes get detail panels; the rest are available on demand"
+    )
+    show_performance = st.sidebar.checkbox(
+        "Show performance timings",
+        help="Latency percentiles per stage: extraction, prompt build, LLM call, parsing, ranking, ..."
+    )
+    prefilter = None
+    if st.sidebar.checkbox(
+        "Local prefilter",
+        help="Score resumes locally (BM25) and send only the most relevant ones to the LLM"
+    ):
+        prefilter = Prefilter(
+            keep_percentile=st.sidebar.slider(
+                "Send top % to the LLM", min_value=1, max_value=100,
+                value=int(DEFAULT_KEEP_PERCENTILE)
+            ),
+            min_score=st.sidebar.slider(
+                "Minimum relevance vs. best resume", min_value=0.0, max_value=1.0,
+                value=DEFAULT_MIN_SCORE, step=0.05
+            )
+        )
 
     # Job description input
     st.subheader("Job Description")
@@ -54,6 +419,17 @@ def main():
         height=200,
         placeholder="Paste the job description here..."
     )
+    if job_description:
+        # Compiled once per distinct JD and reused by every resume in the batch
+        compiled_jd = compile_job_description(job_description)
+        with st.expander("Extracted requirements"):
+            st.write("**Seniority (guessed from wording):**", compiled_jd.seniority or "Not stated",
+                     f"({compiled_jd.min_years}+ years)" if compiled_jd.min_years else "")
+            st.write("**Required skills:**", ", ".join(compiled_jd.required) or "None found")
+            st.write("**Preferred skills:**", ", ".join(compiled_jd.preferred) or "None found")
+            if compiled_jd.key_phrases:
+                st.write("**Key phrases:**", ", ".join(compiled_jd.key_phrases))
+            st.caption(f"Condensed from {len(job_description):,} to {len(compiled_jd.text):,} characters")
 
     # Update file uploader to accept both PDF and DOCX
     st.subheader("Upload Resumes")
@@ -68,39 +444,47 @@ def main():
         st.write(f"📄 {len(uploaded_files)} resume(s) uploaded")
 
     if st.button("Analyze Resumes", key='analyze') and uploaded_files and job_description:
+        engine = BatchEngine(
+            analyzer,
+            max_in_flight=max_in_flight,
+            text_cache=text_cache,
+            result_cache=result_cache,
+            extraction_pool=get_extraction_pool(),
+            warm_prompt_cache=len(uploaded_files) > 1
+        )
+        # Drop the previous view so a failed run doesn't show stale results
+        st.session_state.pop("analysis", None)
+        stage_timings = StageTimings()
         if len(uploaded_files) == 1:
             # Single resume analysis
             try:
                 with st.spinner("Analyzing resume..."):
-                    # Extract text from the resume
-                    resume_text = analyzer.extract_text_from_pdf(uploaded_files[0])
+                    spans = {}
+                    # Extract text with the parser matching the file's content
+                    with timed(spans, "extract"):
+                        resume_text, backend = engine.extract(uploaded_files[0])
                     
-                    # Analyze the resume
-                    result = analyzer.analyze_resume(resume_text, job_description)
+                    # Analyze the resume (or reuse an earlier identical analysis)
+                    with timed(spans, "analyze"):
+                        result = engine.analyze(resume_text, job_description)
                     
                     if isinstance(result, dict) and "JD Match" in result:
-                        # Display results
-                        st.success("Analysis completed!")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.metric("Job Description Match", result["JD Match"])
-                        
-                        with col2:
-                            st.subheader("Missing Keywords")
-                            if result["MissingKeywords"]:
-                                for keyword in result["MissingKeywords"]:
-                                    st.write("•", keyword)
-                            else:
-                                st.write("No missing keywords found")
-                        
-                        st.subheader("Profile Summary")
-                        st.info(result["Profile Summary"])
-                        
-                        st.subheader("Suggestions")
-                        for suggestion in result["Suggestions"]:
-                            st.warning("• " + suggestion)
+                        result = dict(result, filename=uploaded_files[0].name, extractor=backend)
+                        result["timings"] = dict(spans, **result.get("timings", {}))
+                        stage_timings.add_result(result)
+                        get_usage_ledger().record(ledger_entry(
+                            [result],
+                            analyzer.model,
+                            getattr(analyzer, "prompt_version", None),
+                            compile_job_description(job_description).digest
+                        ))
+                        if not is_error_result(result):
+                            get_session_results(job_description, analyzer)[
+                                content_hash(read_bytes(uploaded_files[0]))
+                            ] = {k: v for k, v in result.items() if k not in RUN_FIELDS}
+                        st.session_state["analysis"] = {
+                            "mode": "single", "result": result, "timings": stage_timings
+                        }
                     else:
                         st.error("Invalid response format from the analyzer")
                     
@@ -110,66 +494,84 @@ def main():
         else:
             # Multiple resume analysis
             try:
-                with st.spinner(f"Analyzing {len(uploaded_files)} resumes... This may take a while."):
-                    # Prepare resume files for batch processing
-                    resume_files = [(file.name, file) for file in uploaded_files]
-                    
-                    # Analyze multiple resumes
-                    results = analyzer.analyze_multiple_resumes(resume_files, job_description)
-                    
-                    if results:
-                        st.success(f"Successfully analyzed {len(results)} resumes!")
-                        
-                        # Add download button for detailed analysis
-                        report = create_analysis_report(results)
-                        st.download_button(
-                            label="Download Detailed Analysis Report",
-                            data=report,
-                            file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                            mime="text/plain"
-                        )
-                        
-                        # Create a summary table
-                        summary_data = []
-                        for i, result in enumerate(results):
-                            summary_data.append({
-                                "Rank": i + 1,
-                                "Resume": result.get("filename", "Unknown"),
-                                "Match %": result.get("JD Match", "0%"),
-                                "Missing Keywords": ", ".join(result.get("MissingKeywords", [])) if result.get("MissingKeywords") else "None"
-                            })
-                        
-                        # Display summary table
-                        st.subheader("Resume Ranking")
-                        df = pd.DataFrame(summary_data)
-                        st.dataframe(df, use_container_width=True)
-                        
-                        # Detailed results in expandable sections
-                        st.subheader("Detailed Analysis")
-                        for i, result in enumerate(results):
-                            with st.expander(f"#{i+1}: {result.get('filename', 'Unknown')} - {result.get('JD Match', '0%')} Match"):
-                                st.subheader("Profile Summary")
-                                st.info(result.get("Profile Summary", "No summary available"))
-                                
-                                st.subheader("Missing Keywords")
-                                if result.get("MissingKeywords"):
-                                    for keyword in result.get("MissingKeywords"):
-                                        st.write("•", keyword)
-                                else:
-                                    st.write("No missing keywords found")
-                                
-                                st.subheader("Suggestions")
-                                for suggestion in result.get("Suggestions", []):
-                                    st.warning("• " + suggestion)
-                    else:
-                        st.error("Failed to analyze resumes. Please try again.")
+                # Show each resume as soon as it finishes instead of one long spinner
+                progress = st.progress(0.0, text=f"Analyzing {len(uploaded_files)} resumes...")
+                live_view = st.empty()
+                started = time.monotonic()
+                timings = {"first": None, "rendered": 0.0}
+
+                def show_progress(completed, total, top):
+                    now = time.monotonic()
+                    if timings["first"] is None:
+                        timings["first"] = now - started
+                    progress.progress(completed / total, text=f"Analysed {completed}/{total} resumes")
+                    if completed == 1 or now - timings["rendered"] >= LIVE_REFRESH_SECONDS:
+                        timings["rendered"] = now
+                        partial = top.results()
+                        with live_view.container():
+                            st.caption(f"Top {len(partial)} of {top.seen} results so far")
+                            render_ranking(partial, build_summary_table(partial))
+
+                # Checkpoint every finished resume; re-running the same batch
+                # after a restart or failure skips what is already done
+                job_id = make_job_id(
+                    engine.fingerprint(job_description),
+                    [content_hash(read_bytes(file)) for file in uploaded_files]
+                )
+                engine.journal = Journal(job_id, get_journal_dir())
+
+                # Analyze only resumes not yet scored in this session, concurrently
+                results, analysed_count = analyze_incrementally(
+                    engine, uploaded_files, job_description,
+                    on_progress=show_progress, top_k=top_k, timings=stage_timings,
+                    prefilter=prefilter
+                )
+                progress.empty()
+                live_view.empty()
+                
+                if results:
+                    # Only resumes analysed by this click carry usage, so
+                    # reused ones are not billed twice in the ledger
+                    get_usage_ledger().record(ledger_entry(
+                        results,
+                        analyzer.model,
+                        getattr(analyzer, "prompt_version", None),
+                        compile_job_description(job_description).digest,
+                        job_id
+                    ))
+                    with stage_timings.span("summary"):
+                        summary = build_summary_table(results)
+                    st.session_state["analysis"] = {
+                        "mode": "batch",
+                        "results": results,
+                        "analysed_count": analysed_count,
+                        "summary": summary,
+                        "generated": datetime.now(),
+                        "first_result_seconds": timings["first"],
+                        "total_seconds": time.monotonic() - started,
+                        "top_k": top_k,
+                        "job_id": job_id,
+                        "timings": stage_timings
+                    }
+                else:
+                    st.error("Failed to analyze resumes. Please try again.")
                         
             except Exception as e:
                 st.error(f"Error occurred: {str(e)}")
                 st.error("Please try again with different resumes or job description")
-    
-    else:
+
+    # Render from session state so expanders and downloads never re-run the analysis
+    analysis = st.session_state.get("analysis")
+    if analysis is None:
         st.warning("Please upload at least one resume and provide a job description.")
+    else:
+        with analysis["timings"].span("render"):
+            if analysis["mode"] == "single":
+                render_single_result(analysis["result"])
+            else:
+                render_batch_results(analysis)
+        if show_performance:
+            render_performance(analysis["timings"])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+"""Stand-in for the OpenAI chat completions endpoint, for rate limiter tests.
+
+Each request takes the next status from a script (200 once it runs out). A
+429 carries a Retry-After header; a 200 is a chat completion with fixed usage.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
+class FakeOpenAI:
+    def __init__(self, statuses=(), retry_after="0.1"):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def next_status(self):
+        with self._lock:
+            self.requests += 1
+            return self.statuses.pop(0) if self.statuses else 200
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status = fake.next_status()
+                if status == 200:
+                    message = {"role": "assistant", "content": '{"JD Match": "70%"}'}
+                    body = {"id": "fake", "object": "chat.completion", "created": 0, "model": "fake",
+                            "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+                            "usage": USAGE}
+                else:
+                    body = {"error": {"message": "Rate limit reached", "type": "requests",
+                                      "code": "rate_limit_exceeded"}}
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                if status == 429 and fake.retry_after is not None:
+                    self.send_header("Retry-After", fake.retry_after)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,65 @@
+import io
+import threading
+
+import docx
+
+from batch import BatchEngine
+from journal import Journal
+from prefilter import Prefilter
+
+JOB_DESCRIPTION = "Python Django developer"
+
+def make_docx(text):
+    document = docx.Document()
+    document.add_paragraph(text)
+    data = io.BytesIO()
+    document.save(data)
+    return io.BytesIO(data.getvalue())
+
+class FakeAnalyzer:
+    model = "fake"
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def analyze_resume(self, resume_text, job_description):
+        with self._lock:
+            self.calls += 1
+        return {"JD Match": f"{len(resume_text) % 100}%", "MissingKeywords": [],
+                "Profile Summary": "ok", "Suggestions": []}
+
+def make_resumes(count):
+    return [(f"resume_{i}.docx", make_docx("python django developer " * (i % 5 + 1) + "cook " * i))
+            for i in range(count)]
+
+def test_journal_resume_with_prefilter_sends_nothing_new(tmp_path):
+    resumes = make_resumes(12)
+    analyzer = FakeAnalyzer()
+    calls = []
+    for _ in range(3):
+        engine = BatchEngine(analyzer, max_in_flight=3, prefilter=Prefilter(keep_percentile=25),
+                             journal=Journal("job", str(tmp_path)))
+        results = engine.run(resumes, JOB_DESCRIPTION)
+        assert len(results) == 12
+        calls.append(analyzer.calls)
+    assert calls == [3, 3, 3]
+    assert sum(1 for result in results if result.get("resumed")) == 3
+    assert sum(1 for result in results if result.get("prefiltered")) == 9
+
+def test_journal_resume_without_prefilter(tmp_path):
+    resumes = make_resumes(4)
+    analyzer = FakeAnalyzer()
+    BatchEngine(analyzer, journal=Journal("job", str(tmp_path))).run(resumes[:2], JOB_DESCRIPTION)
+    results = BatchEngine(analyzer, journal=Journal("job", str(tmp_path))).run(resumes, JOB_DESCRIPTION)
+    assert analyzer.calls == 4
+    assert sorted(result["filename"] for result in results if result.get("resumed")) == [
+        "resume_0.docx", "resume_1.docx"
+    ]
+
+def test_prompt_prefix_cacheable_asks_the_analyzer():
+    analyzer = FakeAnalyzer()
+    engine = BatchEngine(analyzer, warm_prompt_cache=True)
+    assert engine.prompt_prefix_cacheable(JOB_DESCRIPTION)
+    analyzer.caches_prompt_prefix = lambda job_description: False
+    assert not engine.prompt_prefix_cacheable(JOB_DESCRIPTION)
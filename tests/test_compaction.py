@@ -0,0 +1,46 @@
+from compaction import LOW_PRIORITY_HEADINGS, Compactor, clean_lines
+
+def make_resume():
+    experience = [f"- Delivered project {i} for a client in the retail sector" for i in range(40)]
+    publications = [f"- Paper {i}: A study of distributed systems at scale" for i in range(20)]
+    return "\n".join(
+        ["Jane Doe", "PROGRAMMING LANGUAGES", "Python, Go, Rust", "LANGUAGES", "English, French"]
+        + ["EXPERIENCE", "Software Engineer, Acme"] + experience
+        + ["PUBLICATIONS"] + publications
+    )
+
+def test_programming_languages_kept_over_filler():
+    text, stats = Compactor(300).compact(make_resume())
+    assert stats["truncated"]
+    assert stats["tokens_after"] <= 300
+    assert "PROGRAMMING LANGUAGES\nPython, Go, Rust" in text
+    assert "- Delivered project 0 for a client in the retail sector" in text
+    # Filler experience is cut before the skills; spoken languages go first
+    assert "- Delivered project 39 for a client in the retail sector" not in text
+    assert "English, French" not in text
+    assert "Paper 0" not in text
+
+def test_only_spoken_languages_are_low_priority():
+    for heading in ("Languages", "Spoken Languages", "Language Skills", "Awards and Honours"):
+        assert LOW_PRIORITY_HEADINGS.match(heading)
+    for heading in ("Programming Languages", "Languages and Frameworks", "Technical Skills"):
+        assert not LOW_PRIORITY_HEADINGS.match(heading)
+
+def test_boilerplate_sections_dropped_but_personal_profile_kept():
+    lines = clean_lines("Personal Profile\nSeasoned engineer\nReferences\nAvailable on request\nPage 2 of 3")
+    assert lines == ["Personal Profile", "Seasoned engineer"]
+
+def test_running_headers_need_page_breaks():
+    page = "Jane Doe\nSoftware Engineer\nKey achievements:\n- item {}"
+    pages = [page.format(i) for i in range(4)]
+    paged = clean_lines("\f".join(pages))
+    assert paged.count("Software Engineer") == 1
+    assert paged.count("Key achievements:") == 1
+    # Without page breaks a repeated title may be content, so it stays
+    assert clean_lines("\n".join(pages)).count("Software Engineer") == 4
+    assert clean_lines("\f".join(pages), strip_running=False).count("Software Engineer") == 4
+
+def test_zero_budget_keeps_everything_but_boilerplate():
+    text, stats = Compactor(0).compact(make_resume())
+    assert not stats["truncated"]
+    assert "Paper 19" in text
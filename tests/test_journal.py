@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from journal import Journal, make_job_id
+
+def test_make_job_id_ignores_order_and_duplicates():
+    assert make_job_id("fp", ["b", "a", "a"]) == make_job_id("fp", ["a", "b"])
+    assert make_job_id("fp", ["a", "b"]) != make_job_id("other", ["a", "b"])
+
+def test_load_returns_appended_results(tmp_path):
+    journal = Journal("job", str(tmp_path))
+    assert journal.load("fp") == {}
+    journal.append("d1", {"JD Match": "70%"})
+    journal.append("d2", {"JD Match": "40%"})
+    assert Journal("job", str(tmp_path)).load("fp") == {
+        "d1": {"JD Match": "70%"}, "d2": {"JD Match": "40%"}
+    }
+
+def test_truncated_last_line_is_dropped_and_overwritten(tmp_path):
+    journal = Journal("job", str(tmp_path))
+    journal.load("fp")
+    journal.append("d1", {"JD Match": "70%"})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"key": "d2", "result": {"JD Ma')  # process died mid-write
+    assert journal.load("fp") == {"d1": {"JD Match": "70%"}}
+    journal.append("d3", {"JD Match": "10%"})
+    assert journal.load("fp") == {"d1": {"JD Match": "70%"}, "d3": {"JD Match": "10%"}}
+    with open(journal.path, encoding="utf-8") as f:
+        assert all(json.loads(line) for line in f)
+
+def test_malformed_entries_are_skipped(tmp_path):
+    journal = Journal("job", str(tmp_path))
+    journal.load("fp")
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"fingerprint": "fp", "created": 0}) + "\n")
+        f.write("[1, 2]\nnot json\n")
+    journal.append("d1", {"JD Match": "70%"})
+    assert journal.load("fp") == {"d1": {"JD Match": "70%"}}
+
+def test_fingerprint_mismatch_raises(tmp_path):
+    Journal("job", str(tmp_path)).load("fp")
+    with pytest.raises(ValueError):
+        Journal("job", str(tmp_path)).load("different settings")
+
+def test_truncated_header_starts_over(tmp_path):
+    journal = Journal("job", str(tmp_path))
+    with open(journal.path, "w", encoding="utf-8") as f:
+        f.write('{"fingerpr')
+    assert journal.load("fp") == {}
+    assert Journal("job", str(tmp_path)).load("fp") == {}
+
+def test_instances_share_a_lock_per_file(tmp_path):
+    assert Journal("job", str(tmp_path))._lock is Journal("job", str(tmp_path))._lock
+    assert Journal("job", str(tmp_path))._lock is not Journal("other", str(tmp_path))._lock
+
+@pytest.mark.parametrize("job_id", ["", "../x", ".hidden"])
+def test_invalid_job_ids(tmp_path, job_id):
+    with pytest.raises(ValueError):
+        Journal(job_id, str(tmp_path))
@@ -0,0 +1,56 @@
+from keywords import AhoCorasick, KeywordMatcher, extract_required_terms
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick({"he": "he", "she": "she", "his": "his", "hers": "hers"})
+    matches = sorted(automaton.iter_matches("ushers his"))
+    # "ushers" is one word, so nothing inside it counts; "his" stands alone
+    assert matches == [(7, 10, "his")]
+    assert sorted(automaton.iter_matches("she hers he")) == [
+        (0, 3, "she"), (4, 8, "hers"), (9, 11, "he")
+    ]
+
+def test_aho_corasick_whole_words_only():
+    automaton = AhoCorasick({"java": "Java", "javascript": "JavaScript"})
+    assert [value for _, _, value in automaton.iter_matches("javascript, java.")] == [
+        "JavaScript", "Java"
+    ]
+
+def test_aho_corasick_symbols_in_patterns():
+    automaton = AhoCorasick({"c++": "C++", "c#": "C#", "node.js": "Node.js"})
+    assert [value for _, _, value in automaton.iter_matches("c++ and c# on node.js")] == [
+        "C++", "C#", "Node.js"
+    ]
+
+def test_extract_required_terms_uses_vocabulary_only():
+    jd = ("Acme GmbH in Berlin is hiring. Data is our product. Salary: competitive.\n"
+          "You know Python, dbt and Snowflake, and build REST APIs on AWS.")
+    assert extract_required_terms(jd) == ["Python", "dbt", "Snowflake", "REST APIs", "AWS"]
+
+def test_extract_required_terms_synonyms_and_order():
+    assert extract_required_terms("k8s, golang, PostgreSQL and postgres; ML") == [
+        "Kubernetes", "Go", "PostgreSQL", "Machine Learning"
+    ]
+
+def test_extract_required_terms_ambiguous_words_need_a_name():
+    assert extract_required_terms("You excel at the rest of the work.") == []
+    assert extract_required_terms("Rest assured. We use Spring and Excel daily.") == [
+        "Spring", "Excel"
+    ]
+
+def test_keyword_matcher_missing_in_jd_order():
+    matcher = KeywordMatcher(["Python", "Kubernetes", "JavaScript"])
+    assert matcher.missing("Wrote python services deployed with k8s") == ["JavaScript"]
+    assert matcher.found("JS and Python3") == {"JavaScript", "Python"}
+
+def test_extract_required_terms_bulleted_list():
+    jd = "Requirements:\n- Rust\n- Swift\n* Go\n• Excel\n- Python"
+    assert extract_required_terms(jd) == ["Rust", "Swift", "Go", "Excel", "Python"]
+
+def test_extract_required_terms_line_start_names():
+    assert extract_required_terms("Skills\nGo, Rust\nGo beyond the brief.") == ["Go", "Rust"]
+
+def test_keyword_matcher_ambiguous_words_in_resume():
+    matcher = KeywordMatcher(["REST APIs", "Go", "Excel", "Spring"])
+    resume = "I excel at go-to-market work; did the rest in spring 2020 internship."
+    assert matcher.missing(resume) == ["REST APIs", "Go", "Excel", "Spring"]
+    assert matcher.missing("Built REST services in Go and Spring.\n- Excel") == []
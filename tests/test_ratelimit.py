@@ -0,0 +1,52 @@
+import time
+
+import openai
+import pytest
+
+from fake_openai import USAGE, FakeOpenAI
+from ratelimit import AdaptiveLimiter
+
+def make_call(server):
+    client = openai.OpenAI(api_key="test", base_url=server.base_url, max_retries=0)
+    return lambda: client.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}]
+    )
+
+def test_rate_limit_halves_concurrency_and_honours_retry_after():
+    with FakeOpenAI([429], retry_after="0.3") as server:
+        limiter = AdaptiveLimiter(initial_concurrency=8, max_retries=2)
+        started = time.monotonic()
+        response = limiter.call(make_call(server))
+        elapsed = time.monotonic() - started
+    assert response.usage.total_tokens == USAGE["total_tokens"]
+    assert server.requests == 2
+    assert limiter.stats == {"calls": 1, "retries": 1, "rate_limited": 1}
+    # Halved from 8, then one additive step for the successful retry
+    assert limiter.limit == pytest.approx(4.25)
+    assert elapsed >= 0.3
+
+def test_decrease_at_most_once_per_round_trip():
+    limiter = AdaptiveLimiter(initial_concurrency=16)
+    limiter.on_success(10.0)
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.limit == pytest.approx((16 + 1 / 16) / 2)
+    assert limiter.stats["rate_limited"] == 2
+
+def test_retry_limit_reraises_rate_limit_error():
+    with FakeOpenAI([429] * 10, retry_after="0") as server:
+        limiter = AdaptiveLimiter(max_retries=2)
+        with pytest.raises(openai.RateLimitError):
+            limiter.call(make_call(server))
+    assert server.requests == 3
+    assert limiter.stats["retries"] == 2
+    assert limiter.stats["calls"] == 0
+    assert limiter.in_flight == 0
+
+def test_tokens_charged_once_across_retries():
+    with FakeOpenAI([429, 429], retry_after="0") as server:
+        limiter = AdaptiveLimiter(tokens_per_minute=60000, max_retries=3)
+        limiter.call(make_call(server), tokens=10000)
+    assert server.requests == 3
+    # Refill during the test is far below one retry's worth of tokens
+    assert limiter.tokens.capacity - limiter.tokens.level == pytest.approx(10000, abs=1000)
@@ -0,0 +1,19 @@
+import time
+
+from result_cache import ResultCache, make_key
+
+def test_put_get_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"))
+    key = make_key("resume", "jd", "gpt-4o-mini", "v1")
+    assert cache.get(key) is None
+    cache.put(key, {"JD Match": "70%"})
+    assert cache.get(key) == {"JD Match": "70%"}
+
+def test_purge_expired_deletes_unread_rows(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"), ttl=60)
+    cache.put("old", {"JD Match": "10%"})
+    cache.put("new", {"JD Match": "20%"})
+    with cache._conn:
+        cache._conn.execute("UPDATE results SET created = ? WHERE key = 'old'", (time.time() - 120,))
+    cache.purge_expired()
+    assert [row[0] for row in cache._conn.execute("SELECT key FROM results")] == ["new"]
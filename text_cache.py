@@ -0,0 +1,113 @@
+"""Content-addressed on-disk cache for extracted resume text."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "RESUME_TEXT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_analyser", "text")
+)
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_TEXT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Bump when the shape of extracted text changes (2: PDF pages separated by "\f")
+TEXT_FORMAT = 2
+
+def content_hash(data):
+    """SHA-256 hex digest of raw file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def read_bytes(file):
+    """Return the full contents of an uploaded file without moving its cursor."""
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    position = file.tell()
+    file.seek(0)
+    data = file.read()
+    file.seek(position)
+    return data
+
+class TextCache:
+    """Extracted text keyed by file content hash, evicted least recently used first.
+
+    Each entry records the extractor that produced it, so switching extractors
+    (or upgrading one) naturally misses instead of serving stale text.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json")
+
+    def get(self, digest, extractor):
+        """Return cached text for this content and extractor, or None."""
+        path = self._path(digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if entry.get("extractor") != extractor or entry.get("format") != TEXT_FORMAT:
+            return None
+        return entry.get("text")
+
+    def put(self, digest, extractor, text):
+        """Store extracted text and evict old entries if over the size bound."""
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = json.dumps({"extractor": extractor, "format": TEXT_FORMAT, "text": text}).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_or_extract(self, data, extract, extractor):
+        """Return text for file bytes, calling extract(data) only on a miss."""
+        digest = content_hash(data)
+        text = self.get(digest, extractor)
+        if text is None:
+            text = extract(data)
+            self.put(digest, extractor, text)
+        return text
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Drop the least recently used entries until we are back under ~90% of the bound
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(self._entries()):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
@@ -0,0 +1,66 @@
+"""Lightweight per-stage timing spans, aggregated into latency percentiles per batch."""
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+@contextmanager
+def timed(spans, stage):
+    """Add the seconds spent in the block to spans[stage] (a plain dict)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[stage] = spans.get(stage, 0.0) + time.perf_counter() - started
+
+class StageTimings:
+    """Samples of seconds per stage, from per-resume result["timings"] dicts
+    and from batch-level spans, summarised as count/total/p50/p95/p99/max."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def add_result(self, result):
+        for stage, seconds in (result.get("timings") or {}).items():
+            self.add(stage, seconds)
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def summary(self):
+        """{stage: {"count", "total", "p50", "p95", "p99", "max"}} in seconds, by total desc."""
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self.samples.items() if values}
+        summary = {}
+        for stage, values in sorted(samples.items(), key=lambda item: -item[1].sum()):
+            stats = {"count": int(len(values)), "total": float(values.sum())}
+            for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                stats[f"p{q}"] = float(value)
+            stats["max"] = float(values.max())
+            summary[stage] = stats
+        return summary
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+def stage_timings(results):
+    """StageTimings filled from the per-resume timings of a batch of results."""
+    timings = StageTimings()
+    for result in results:
+        timings.add_result(result)
+    return timings
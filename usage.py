@@ -0,0 +1,95 @@
+"""Token and cost accounting for LLM calls, per resume, per batch and over time."""
+import json
+import os
+import threading
+import time
+
+# USD per million tokens: (input, cached input, output). Override or extend
+# with a JSON file of {"model": [input, cached, output]} in RESUME_PRICES_PATH.
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+}
+PRICES_PATH = os.getenv("RESUME_PRICES_PATH")
+if PRICES_PATH and os.path.exists(PRICES_PATH):
+    with open(PRICES_PATH, encoding="utf-8") as f:
+        PRICES.update({model: tuple(prices) for model, prices in json.load(f).items()})
+
+DEFAULT_LEDGER_PATH = os.getenv(
+    "RESUME_USAGE_LEDGER",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_analyser", "usage_ledger.jsonl")
+)
+TOKEN_FIELDS = ("prompt_tokens", "cached_tokens", "completion_tokens", "total_tokens")
+
+def model_prices(model):
+    """(input, cached input, output) USD per million tokens, or None if unknown.
+
+    Dated snapshots ("gpt-4o-mini-2024-07-18") are priced like their base model.
+    """
+    for name in sorted(PRICES, key=len, reverse=True):
+        if model == name or model.startswith(name + "-"):
+            return PRICES[name]
+    return None
+
+def cost_usd(model, usage):
+    """Cost of one call's usage dict, or None when the model has no known price."""
+    prices = model_prices(model)
+    if prices is None:
+        return None
+    input_price, cached_price, output_price = prices
+    cached = usage.get("cached_tokens", 0)
+    uncached = usage.get("prompt_tokens", 0) - cached
+    return (uncached * input_price + cached * cached_price
+            + usage.get("completion_tokens", 0) * output_price) / 1_000_000
+
+def usage_totals(results):
+    """Token and cost totals over the results that made an API call in this run."""
+    usages = [result["usage"] for result in results if result.get("usage")]
+    totals = {field: sum(usage.get(field, 0) for usage in usages) for field in TOKEN_FIELDS}
+    costs = [usage.get("cost_usd") for usage in usages]
+    totals["calls"] = len(usages)
+    # Unknown prices make the total unknown rather than silently low
+    totals["cost_usd"] = sum(costs) if None not in costs else None
+    return totals
+
+def ledger_entry(results, model, prompt_version=None, job_key=None, job_id=None):
+    """One ledger line describing a batch: what ran and what it used."""
+    return dict(
+        usage_totals(results),
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        job_id=job_id,
+        model=model,
+        prompt_version=prompt_version,
+        job_key=job_key,
+        resumes=len(results),
+        cache_hits=sum(1 for result in results if result.get("cached")),
+    )
+
+class UsageLedger:
+    """Append-only JSONL file with one line per batch, for trending cost over time."""
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def record(self, entry):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def read(self):
+        """Every entry so far, oldest first; unreadable lines are skipped."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries